@@ -21,6 +21,7 @@ import unicodedata
 import sys
 import re
 import os
+from functools import lru_cache
 from typing import Optional, List, Tuple
 
 try:
@@ -30,16 +31,20 @@ try:
         ROOT_WIDTH, ROOT_HEIGHT, STATUS_HEIGHT,
         DEFAULT_CANVAS_WIDTH, DEFAULT_CANVAS_HEIGHT,
         DEFAULT_FG, CURSOR_BLINK_RATE,
-        COLOR_PALETTE_FG, PALETTE_CATEGORIES, CATEGORY_HOTKEYS, KEY_TO_INDEX,
+        COLOR_PALETTE_FG, PALETTE_CATEGORIES, CATEGORY_HOTKEY_INDEX, KEY_TO_INDEX,
         EditorMode, Cell, SpriteFrame, AnimationFrame, AnimationDef,
         SpriteLibraryEntry, SpriteInstance,
-        get_current_category_chars, get_all_library_sprites,
+        get_current_category_chars, get_all_library_sprites, split_library_key,
+        get_sorted_library_paths, get_sorted_animation_names, normalize_color,
     )
     from .rendering import (
         render, generate_vicinity_chars, get_random_char,
         start_animation_preview, stop_animation_preview,
     )
-    from .file_io import save_file, load_file, GENERATED_DIR
+    from .file_io import (
+        save_file, load_file, GENERATED_DIR,
+        read_sprite_defs_cache, write_sprite_defs_cache,
+    )
 except ImportError:
     import models
     from models import (
@@ -47,65 +52,61 @@ except ImportError:
         ROOT_WIDTH, ROOT_HEIGHT, STATUS_HEIGHT,
         DEFAULT_CANVAS_WIDTH, DEFAULT_CANVAS_HEIGHT,
         DEFAULT_FG, CURSOR_BLINK_RATE,
-        COLOR_PALETTE_FG, PALETTE_CATEGORIES, CATEGORY_HOTKEYS, KEY_TO_INDEX,
+        COLOR_PALETTE_FG, PALETTE_CATEGORIES, CATEGORY_HOTKEY_INDEX, KEY_TO_INDEX,
         EditorMode, Cell, SpriteFrame, AnimationFrame, AnimationDef,
         SpriteLibraryEntry, SpriteInstance,
-        get_current_category_chars, get_all_library_sprites,
+        get_current_category_chars, get_all_library_sprites, split_library_key,
+        get_sorted_library_paths, get_sorted_animation_names, normalize_color,
     )
     from rendering import (
         render, generate_vicinity_chars, get_random_char,
         start_animation_preview, stop_animation_preview,
     )
-    from file_io import save_file, load_file, GENERATED_DIR
+    from file_io import (
+        save_file, load_file, GENERATED_DIR,
+        read_sprite_defs_cache, write_sprite_defs_cache,
+    )
 
 
 # ============================================================================
 # INPUT HANDLING
 # ============================================================================
 
+def enter_modal_screen(mode):
+    """Switch to a full-screen overlay mode, hiding the editor windows once."""
+    state.mode = mode
+    models.sprite_win.visible = False
+    models.status_win.visible = False
+
+
 def on_key(key):
     """Handle keyboard input based on current mode"""
-    if state.mode == EditorMode.HELP:
-        # Page navigation in help
-        if key in (pygame.K_LEFT, pygame.K_h):
-            state.help_page = max(0, state.help_page - 1)
-            return
-        elif key in (pygame.K_RIGHT, pygame.K_l):
-            state.help_page = min(1, state.help_page + 1)
-            return
-        # Close help on Esc, Enter, or other keys
-        state.mode = EditorMode.NORMAL
-        state.help_page = 0  # Reset to first page
-        models.sprite_win.visible = True
-        models.status_win.visible = True
+    # Handlers test modifiers several times per key, so query SDL once
+    state.key_mods = pygame.key.get_mods()
+    handler = MODE_HANDLERS.get(state.mode)
+    if handler is not None:
+        handler(key)
+
+
+def handle_help(key):
+    """Handle keys in the help overlay"""
+    # Page navigation in help
+    if key in (pygame.K_LEFT, pygame.K_h):
+        state.help_page = max(0, state.help_page - 1)
+        return
+    elif key in (pygame.K_RIGHT, pygame.K_l):
+        state.help_page = min(1, state.help_page + 1)
         return
-    if state.mode == EditorMode.NORMAL:
-        handle_normal_mode(key)
-    elif state.mode == EditorMode.INSERT:
-        handle_insert_mode(key)
-    elif state.mode == EditorMode.VISUAL:
-        handle_visual_mode(key)
-    elif state.mode == EditorMode.COMMAND:
-        handle_command_mode(key)
-    elif state.mode == EditorMode.PALETTE_CATEGORIES:
-        handle_palette_categories(key)
-    elif state.mode == EditorMode.PALETTE_QWERTY:
-        handle_palette_qwerty(key)
-    elif state.mode == EditorMode.PALETTE_CODEPOINT:
-        handle_palette_codepoint(key)
-    elif state.mode == EditorMode.ANIMATION_EDITOR:
-        handle_animation_editor(key)
-    elif state.mode == EditorMode.ANIMATION_PREVIEW:
-        handle_animation_preview(key)
-    elif state.mode == EditorMode.SPRITE_LIBRARY:
-        handle_sprite_library(key)
-    elif state.mode == EditorMode.SPRITE_PICKER:
-        handle_sprite_picker(key)
+    # Close help on Esc, Enter, or other keys
+    state.mode = EditorMode.NORMAL
+    state.help_page = 0  # Reset to first page
+    models.sprite_win.visible = True
+    models.status_win.visible = True
 
 
 def handle_sprite_library(key):
     """Handle keys in sprite library mode"""
-    lib_paths = sorted(state.sprite_library.keys())
+    lib_paths = get_sorted_library_paths()
 
     if is_escape(key):
         state.mode = EditorMode.NORMAL
@@ -182,14 +183,12 @@ def handle_animation_preview(key):
         # Stop animation and return to editor
         stop_animation_preview()
         state.animation_playing = False
-        state.mode = EditorMode.ANIMATION_EDITOR
-        models.sprite_win.visible = False
-        models.status_win.visible = False
+        enter_modal_screen(EditorMode.ANIMATION_EDITOR)
 
 
 def handle_animation_editor(key):
     """Handle keys in animation editor mode"""
-    anim_names = sorted(state.animations.keys()) if state.animations else []
+    anim_names = get_sorted_animation_names()
 
     if is_escape(key):
         if state.anim_editor_mode == "edit":
@@ -260,7 +259,7 @@ def handle_animation_editor(key):
         anim = state.animations[anim_name]
 
         if key in (pygame.K_j, pygame.K_DOWN):
-            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+            if state.key_mods & pygame.KMOD_SHIFT:
                 # Shift+J: Decrease Y offset (move down visually)
                 if anim.frames and 0 <= state.anim_editor_frame_cursor < len(anim.frames):
                     anim.frames[state.anim_editor_frame_cursor].offset_y += 1
@@ -271,7 +270,7 @@ def handle_animation_editor(key):
                     state.anim_editor_frame_cursor = (state.anim_editor_frame_cursor + 1) % len(anim.frames)
 
         elif key in (pygame.K_k, pygame.K_UP):
-            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+            if state.key_mods & pygame.KMOD_SHIFT:
                 # Shift+K: Increase Y offset (move up visually)
                 if anim.frames and 0 <= state.anim_editor_frame_cursor < len(anim.frames):
                     anim.frames[state.anim_editor_frame_cursor].offset_y -= 1
@@ -288,7 +287,7 @@ def handle_animation_editor(key):
                 state.modified = True
 
         elif key == pygame.K_l:
-            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+            if state.key_mods & pygame.KMOD_SHIFT:
                 # Shift+L: Toggle loop
                 anim.loop = not anim.loop
                 state.modified = True
@@ -396,11 +395,11 @@ def handle_normal_mode(key):
     # Line navigation
     elif key == pygame.K_0:
         state.cursor_x = 0
-    elif key == pygame.K_4 and pygame.key.get_mods() & pygame.KMOD_SHIFT:  # $
+    elif key == pygame.K_4 and state.key_mods & pygame.KMOD_SHIFT:  # $
         state.cursor_x = state.canvas_width - 1
 
     # Scene mode: Shift+D to delete sprite (must be before plain 'd' handler)
-    elif key == pygame.K_d and pygame.key.get_mods() & pygame.KMOD_SHIFT and state.editor_mode == "scene":
+    elif key == pygame.K_d and state.key_mods & pygame.KMOD_SHIFT and state.editor_mode == "scene":
         delete_sprite_at_cursor()
 
     # Multi-key sequences
@@ -412,7 +411,7 @@ def handle_normal_mode(key):
         state.pending_key = 'y'
 
     # Jump to bottom
-    elif key == pygame.K_g and pygame.key.get_mods() & pygame.KMOD_SHIFT:  # G
+    elif key == pygame.K_g and state.key_mods & pygame.KMOD_SHIFT:  # G
         state.cursor_y = state.canvas_height - 1
 
     # Mode switches
@@ -427,7 +426,7 @@ def handle_normal_mode(key):
         state.mode = EditorMode.VISUAL
         state.selection_start = (state.cursor_x, state.cursor_y)
         state.set_status("-- VISUAL --")
-    elif key == pygame.K_SEMICOLON and pygame.key.get_mods() & pygame.KMOD_SHIFT:  # :
+    elif key == pygame.K_SEMICOLON and state.key_mods & pygame.KMOD_SHIFT:  # :
         state.mode = EditorMode.COMMAND
         state.command_buffer = ""
 
@@ -436,7 +435,7 @@ def handle_normal_mode(key):
         # Delete character under cursor
         state.clear_cell(state.cursor_x, state.cursor_y)
 
-    elif key == pygame.K_c and pygame.key.get_mods() & pygame.KMOD_SHIFT:
+    elif key == pygame.K_c and state.key_mods & pygame.KMOD_SHIFT:
         # C = Pick color under cursor
         cell = state.get_cell(state.cursor_x, state.cursor_y)
         if cell:
@@ -467,7 +466,7 @@ def handle_normal_mode(key):
         state.set_status("Undo not yet implemented")
 
     elif key == pygame.K_p:
-        if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+        if state.key_mods & pygame.KMOD_SHIFT:
             # P = paste before
             if state.clipboard:
                 paste_clipboard()
@@ -475,7 +474,7 @@ def handle_normal_mode(key):
                 state.set_status("Clipboard empty")
         else:
             # p = open palette (category screen)
-            state.mode = EditorMode.PALETTE_CATEGORIES
+            enter_modal_screen(EditorMode.PALETTE_CATEGORIES)
             state.palette_cursor = 0
             state.palette_scroll = 0
 
@@ -493,25 +492,25 @@ def handle_normal_mode(key):
 
     elif key == pygame.K_LEFTBRACKET:
         # [ = decrement codepoint by 1, { = by 100
-        shift = pygame.key.get_mods() & pygame.KMOD_SHIFT
+        shift = state.key_mods & pygame.KMOD_SHIFT
         step = 100 if shift else 1
         adjust_codepoint(-step)
 
     elif key == pygame.K_RIGHTBRACKET:
         # ] = increment codepoint by 1, } = by 100
-        shift = pygame.key.get_mods() & pygame.KMOD_SHIFT
+        shift = state.key_mods & pygame.KMOD_SHIFT
         step = 100 if shift else 1
         adjust_codepoint(step)
 
     elif key == pygame.K_MINUS:
         # - = decrement codepoint by 10, _ = by 1000
-        shift = pygame.key.get_mods() & pygame.KMOD_SHIFT
+        shift = state.key_mods & pygame.KMOD_SHIFT
         step = 1000 if shift else 10
         adjust_codepoint(-step)
 
     elif key == pygame.K_EQUALS:
         # = = increment codepoint by 10, + = by 1000
-        shift = pygame.key.get_mods() & pygame.KMOD_SHIFT
+        shift = state.key_mods & pygame.KMOD_SHIFT
         step = 1000 if shift else 10
         adjust_codepoint(step)
 
@@ -530,20 +529,17 @@ def handle_normal_mode(key):
             place_sprite_at_cursor()
         else:
             # Stamp current character at cursor
-            cell = Cell(char=state.current_char, fg=state.current_fg, bg=state.current_bg)
+            cell = Cell.intern(state.current_char, state.current_fg, state.current_bg)
             state.set_cell(state.cursor_x, state.cursor_y, cell)
             # Add to recent chars
-            if state.current_char in state.recent_chars:
-                state.recent_chars.remove(state.current_char)
-            state.recent_chars.insert(0, state.current_char)
-            state.recent_chars = state.recent_chars[:40]
+            add_recent_char(state.current_char)
             # Move cursor by 2 for wide characters, 1 otherwise
             state.cursor_x += 2 if is_wide_char(state.current_char) else 1
             state.clamp_cursor()
 
-    elif key == pygame.K_SLASH and pygame.key.get_mods() & pygame.KMOD_SHIFT:
+    elif key == pygame.K_SLASH and state.key_mods & pygame.KMOD_SHIFT:
         # ? = open help
-        state.mode = EditorMode.HELP
+        enter_modal_screen(EditorMode.HELP)
 
     # Scene mode keybindings
     elif key == pygame.K_t and state.editor_mode == "scene":
@@ -559,22 +555,18 @@ def handle_normal_mode(key):
             state.scene_tool = "char"
             state.set_status("Tool: Character")
 
-    elif key == pygame.K_s and pygame.key.get_mods() & pygame.KMOD_SHIFT and state.editor_mode == "scene":
+    elif key == pygame.K_s and state.key_mods & pygame.KMOD_SHIFT and state.editor_mode == "scene":
         # S = open sprite picker
         if not state.sprite_library:
             state.set_status("No sprites loaded - use :import <file.py>")
         else:
-            state.mode = EditorMode.SPRITE_PICKER
+            enter_modal_screen(EditorMode.SPRITE_PICKER)
             state.sprite_picker_cursor = 0
-            models.sprite_win.visible = False
-            models.status_win.visible = False
 
-    elif key == pygame.K_i and pygame.key.get_mods() & pygame.KMOD_SHIFT and state.editor_mode == "scene":
+    elif key == pygame.K_i and state.key_mods & pygame.KMOD_SHIFT and state.editor_mode == "scene":
         # I = open library manager
-        state.mode = EditorMode.SPRITE_LIBRARY
+        enter_modal_screen(EditorMode.SPRITE_LIBRARY)
         state.sprite_library_cursor = 0
-        models.sprite_win.visible = False
-        models.status_win.visible = False
 
     elif key == pygame.K_a and state.editor_mode == "scene":
         # a = cycle animation on sprite under cursor
@@ -585,7 +577,7 @@ def handle_normal_mode(key):
             state.set_status("No sprite at cursor")
 
     # File operations
-    elif key == pygame.K_s and pygame.key.get_mods() & pygame.KMOD_CTRL:
+    elif key == pygame.K_s and state.key_mods & pygame.KMOD_CTRL:
         if state.file_path:
             save_file(state.file_path)
         else:
@@ -608,16 +600,12 @@ def handle_multi_key(first_key, second_key):
         state.cursor_x = 0
     elif first_key == 'd' and second_key == pygame.K_d:
         # dd - delete line
-        for x in range(state.canvas_width):
-            state.clear_cell(x, state.cursor_y)
+        state.clear_rect(0, state.cursor_y, state.canvas_width - 1, state.cursor_y)
         state.set_status("Line deleted")
     elif first_key == 'y' and second_key == pygame.K_y:
         # yy - yank line
-        state.clipboard = {}
-        for x in range(state.canvas_width):
-            cell = state.get_cell(x, state.cursor_y)
-            if cell:
-                state.clipboard[(x - state.cursor_x, 0)] = Cell(cell.char, cell.fg, cell.bg)
+        state.clipboard = state.copy_rect(0, state.cursor_y, state.canvas_width - 1, state.cursor_y,
+                                          state.cursor_x, state.cursor_y)
         state.set_status("Line yanked")
 
 
@@ -625,7 +613,7 @@ def is_escape(key) -> bool:
     """Check for Escape or Ctrl+[ (vim standard escape alternative)"""
     if key == pygame.K_ESCAPE:
         return True
-    if key == pygame.K_LEFTBRACKET and pygame.key.get_mods() & pygame.KMOD_CTRL:
+    if key == pygame.K_LEFTBRACKET and state.key_mods & pygame.KMOD_CTRL:
         return True
     return False
 
@@ -722,15 +710,27 @@ def handle_visual_mode(key):
         state.selection_start = None
 
 
+def add_recent_char(char: str):
+    """Move char to the front of the recent list (interned, capped at 40).
+
+    Also refreshes the Recent palette category so it always matches.
+    """
+    char = sys.intern(char)
+    recent = state.recent_chars
+    if char in recent:
+        recent.remove(char)
+    recent.insert(0, char)
+    del recent[40:]
+    PALETTE_CATEGORIES[0] = ('Recent', recent[:])
+    state.recent_version += 1
+
+
 def select_char(char: str):
     """Select a character and return to normal mode"""
     state.current_char = char
     state.last_selected_codepoint = ord(char)
     # Add to recent
-    if char in state.recent_chars:
-        state.recent_chars.remove(char)
-    state.recent_chars.insert(0, char)
-    state.recent_chars = state.recent_chars[:40]
+    add_recent_char(char)
     state.mode = EditorMode.NORMAL
     models.sprite_win.visible = True
     models.status_win.visible = True
@@ -785,18 +785,15 @@ def handle_palette_categories(key):
         elif pygame.K_a <= key <= pygame.K_z:
             char = chr(key)  # 'a' to 'z'
             # Handle shift for uppercase
-            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+            if state.key_mods & pygame.KMOD_SHIFT:
                 char = char.upper()
 
         if char and char not in ('r', 'u', 'v'):  # Skip special hotkeys
             # Find the category index for this hotkey
-            try:
-                idx = CATEGORY_HOTKEYS.index(char)
-                if idx < len(PALETTE_CATEGORIES):
-                    state.palette_category = idx
-                    state.mode = EditorMode.PALETTE_QWERTY
-            except ValueError:
-                pass  # Hotkey not found
+            idx = CATEGORY_HOTKEY_INDEX.get(char)
+            if idx is not None and idx < len(PALETTE_CATEGORIES):
+                state.palette_category = idx
+                state.mode = EditorMode.PALETTE_QWERTY
 
 
 def handle_palette_qwerty(key):
@@ -809,9 +806,9 @@ def handle_palette_qwerty(key):
         return
 
     # Check if key is in our keyboard mapping
-    if key in KEY_TO_INDEX:
-        idx = KEY_TO_INDEX[key]
-        shift = pygame.key.get_mods() & pygame.KMOD_SHIFT
+    idx = KEY_TO_INDEX.get(key)
+    if idx is not None:
+        shift = state.key_mods & pygame.KMOD_SHIFT
 
         # With shift, access chars 40-79
         if shift:
@@ -897,10 +894,29 @@ def handle_command_mode(key):
         state.command_buffer += char
 
 
+# Punctuation keys as (unshifted, shifted) characters
+_SPECIAL_KEYS = {
+    pygame.K_SPACE: (' ', ' '),
+    pygame.K_MINUS: ('-', '_'),
+    pygame.K_EQUALS: ('=', '+'),
+    pygame.K_LEFTBRACKET: ('[', '{'),
+    pygame.K_RIGHTBRACKET: (']', '}'),
+    pygame.K_BACKSLASH: ('\\', '|'),
+    pygame.K_SEMICOLON: (';', ':'),
+    pygame.K_QUOTE: ("'", '"'),
+    pygame.K_COMMA: (',', '<'),
+    pygame.K_PERIOD: ('.', '>'),
+    pygame.K_SLASH: ('/', '?'),
+    pygame.K_BACKQUOTE: ('`', '~'),
+}
+SPECIAL_CHARS = {key: chars[0] for key, chars in _SPECIAL_KEYS.items()}
+SPECIAL_CHARS_SHIFT = {key: chars[1] for key, chars in _SPECIAL_KEYS.items()}
+SHIFT_DIGITS = ")!@#$%^&*("
+
+
 def key_to_char(key) -> Optional[str]:
     """Convert pygame key to character, handling shift"""
-    mods = pygame.key.get_mods()
-    shift = mods & pygame.KMOD_SHIFT
+    shift = state.key_mods & pygame.KMOD_SHIFT
 
     # Letter keys
     if pygame.K_a <= key <= pygame.K_z:
@@ -910,35 +926,38 @@ def key_to_char(key) -> Optional[str]:
     # Number keys
     if pygame.K_0 <= key <= pygame.K_9:
         if shift:
-            shift_chars = ")!@#$%^&*("
-            return shift_chars[key - pygame.K_0]
+            return SHIFT_DIGITS[key - pygame.K_0]
         return chr(key)
 
     # Special characters
-    special = {
-        pygame.K_SPACE: ' ',
-        pygame.K_MINUS: '_' if shift else '-',
-        pygame.K_EQUALS: '+' if shift else '=',
-        pygame.K_LEFTBRACKET: '{' if shift else '[',
-        pygame.K_RIGHTBRACKET: '}' if shift else ']',
-        pygame.K_BACKSLASH: '|' if shift else '\\',
-        pygame.K_SEMICOLON: ':' if shift else ';',
-        pygame.K_QUOTE: '"' if shift else "'",
-        pygame.K_COMMA: '<' if shift else ',',
-        pygame.K_PERIOD: '>' if shift else '.',
-        pygame.K_SLASH: '?' if shift else '/',
-        pygame.K_BACKQUOTE: '~' if shift else '`',
-    }
-
-    return special.get(key)
+    return (SPECIAL_CHARS_SHIFT if shift else SPECIAL_CHARS).get(key)
+
+
+# Key handler for each mode (LINE and BOX have none yet)
+MODE_HANDLERS = {
+    EditorMode.NORMAL: handle_normal_mode,
+    EditorMode.INSERT: handle_insert_mode,
+    EditorMode.VISUAL: handle_visual_mode,
+    EditorMode.COMMAND: handle_command_mode,
+    EditorMode.HELP: handle_help,
+    EditorMode.PALETTE_CATEGORIES: handle_palette_categories,
+    EditorMode.PALETTE_QWERTY: handle_palette_qwerty,
+    EditorMode.PALETTE_CODEPOINT: handle_palette_codepoint,
+    EditorMode.ANIMATION_EDITOR: handle_animation_editor,
+    EditorMode.ANIMATION_PREVIEW: handle_animation_preview,
+    EditorMode.SPRITE_LIBRARY: handle_sprite_library,
+    EditorMode.SPRITE_PICKER: handle_sprite_picker,
+}
 
 
 # ============================================================================
 # EDITING OPERATIONS
 # ============================================================================
 
+@lru_cache(maxsize=2048)
 def is_wide_char(char: str) -> bool:
     """Check if a character is wide (takes 2 cells in unifont) by measuring actual render width"""
+    # Cached: the font is fixed for the session and measuring renders a glyph
     try:
         font_tuple = pyunicodegame._fonts.get('unifont')
         if font_tuple:
@@ -955,7 +974,7 @@ def is_wide_char(char: str) -> bool:
 
 def place_current_char(char: str):
     """Place a character at cursor and advance (2 for wide chars)"""
-    cell = Cell(char=char, fg=state.current_fg, bg=state.current_bg)
+    cell = Cell.intern(char, state.current_fg, state.current_bg)
     state.set_cell(state.cursor_x, state.cursor_y, cell)
     # Move cursor by 2 for wide characters, 1 otherwise
     state.cursor_x += 2 if is_wide_char(char) else 1
@@ -973,12 +992,7 @@ def yank_selection():
     min_y = min(sy, state.cursor_y)
     max_y = max(sy, state.cursor_y)
 
-    state.clipboard = {}
-    for y in range(min_y, max_y + 1):
-        for x in range(min_x, max_x + 1):
-            cell = state.get_cell(x, y)
-            if cell:
-                state.clipboard[(x - min_x, y - min_y)] = Cell(cell.char, cell.fg, cell.bg)
+    state.clipboard = state.copy_rect(min_x, min_y, max_x, max_y, min_x, min_y)
 
     count = len(state.clipboard)
     state.set_status(f"Yanked {count} cells")
@@ -995,12 +1009,7 @@ def delete_selection():
     min_y = min(sy, state.cursor_y)
     max_y = max(sy, state.cursor_y)
 
-    count = 0
-    for y in range(min_y, max_y + 1):
-        for x in range(min_x, max_x + 1):
-            if state.get_cell(x, y):
-                state.clear_cell(x, y)
-                count += 1
+    count = state.clear_rect(min_x, min_y, max_x, max_y)
 
     state.cursor_x = min_x
     state.cursor_y = min_y
@@ -1018,10 +1027,8 @@ def fill_selection():
     min_y = min(sy, state.cursor_y)
     max_y = max(sy, state.cursor_y)
 
-    for y in range(min_y, max_y + 1):
-        for x in range(min_x, max_x + 1):
-            cell = Cell(char=state.current_char, fg=state.current_fg, bg=state.current_bg)
-            state.set_cell(x, y, cell)
+    cell = Cell.intern(state.current_char, state.current_fg, state.current_bg)
+    state.fill_rect(min_x, min_y, max_x, max_y, cell)
 
     state.set_status(f"Filled with '{state.current_char}'")
 
@@ -1031,11 +1038,7 @@ def paste_clipboard():
     if not state.clipboard:
         return
 
-    for (dx, dy), cell in state.clipboard.items():
-        x = state.cursor_x + dx
-        y = state.cursor_y + dy
-        if 0 <= x < state.canvas_width and 0 <= y < state.canvas_height:
-            state.set_cell(x, y, Cell(cell.char, cell.fg, cell.bg))
+    state.paste_cells(state.clipboard, state.cursor_x, state.cursor_y)
 
     state.set_status(f"Pasted {len(state.clipboard)} cells")
 
@@ -1067,15 +1070,16 @@ def switch_frame(delta: int):
         state.set_status("Only 1 frame - use :frame to add more")
         return
 
-    # Save current frame
-    state.frames[state.current_frame].cells = dict(state.cells)
+    # Save current frame (by reference: state.cells is the frame's own dict,
+    # so switching frames never copies the cell map)
+    state.frames[state.current_frame].cells = state.cells
 
     # Calculate new frame index
     new_frame = (state.current_frame + delta) % len(state.frames)
     state.current_frame = new_frame
 
     # Load new frame
-    state.cells = dict(state.frames[new_frame].cells)
+    state.cells = state.frames[new_frame].cells
     state.set_status(f"Frame {new_frame + 1}/{len(state.frames)}")
 
 
@@ -1106,6 +1110,11 @@ def toggle_animation_playback():
 # COMMAND EXECUTION
 # ============================================================================
 
+# Argument patterns shared by several commands (and the WxH command line arg)
+SIZE_RE = re.compile(r'(\d+)x(\d+)')
+SETTING_RE = re.compile(r'(\w+)\s*=\s*(\d+)')
+
+
 def execute_command(cmd: str):
     """Execute a : command"""
     cmd = cmd.strip()
@@ -1187,7 +1196,7 @@ def execute_command(cmd: str):
         handle_color_command(args)
 
     elif command == 'help':
-        state.mode = EditorMode.HELP
+        enter_modal_screen(EditorMode.HELP)
 
     elif command == 'scene':
         if state.modified and not force:
@@ -1211,9 +1220,7 @@ def execute_command(cmd: str):
         if state.editor_mode != "scene":
             state.set_status("Library only available in scene mode")
         else:
-            state.mode = EditorMode.SPRITE_LIBRARY
-            models.sprite_win.visible = False
-            models.status_win.visible = False
+            enter_modal_screen(EditorMode.SPRITE_LIBRARY)
 
     elif command == 'tool':
         if state.editor_mode != "scene":
@@ -1247,7 +1254,7 @@ def handle_set_command(args: str):
         state.set_status("Usage: :set width=N or :set height=N")
         return
 
-    match = re.match(r'(\w+)\s*=\s*(\d+)', args)
+    match = SETTING_RE.match(args)
     if match:
         prop, value = match.groups()
         value = int(value)
@@ -1284,10 +1291,10 @@ def handle_color_command(args: str):
         return
 
     if target == 'fg':
-        state.current_fg = (r, g, b)
+        state.current_fg = normalize_color((r, g, b))
         state.set_status(f"FG: #{color_str.upper()}")
     elif target == 'bg':
-        state.current_bg = (r, g, b)
+        state.current_bg = normalize_color((r, g, b))
         state.set_status(f"BG: #{color_str.upper()}")
     else:
         state.set_status("Use 'fg' or 'bg'")
@@ -1298,12 +1305,12 @@ def new_canvas(args: str):
     width, height = DEFAULT_CANVAS_WIDTH, DEFAULT_CANVAS_HEIGHT
 
     if args:
-        match = re.match(r'(\d+)x(\d+)', args.lower())
+        match = SIZE_RE.match(args.lower())
         if match:
             width = int(match.group(1))
             height = int(match.group(2))
 
-    state.cells.clear()
+    state.clear_cells()
     state.canvas_width = width
     state.canvas_height = height
     state.cursor_x = 0
@@ -1327,7 +1334,7 @@ def create_sprite(args: str):
     width, height = 8, 6
 
     if len(parts) > 1:
-        match = re.match(r'(\d+)x(\d+)', parts[1].lower())
+        match = SIZE_RE.match(parts[1].lower())
         if match:
             width = int(match.group(1))
             height = int(match.group(2))
@@ -1339,9 +1346,9 @@ def create_sprite(args: str):
     # Reset state for new sprite
     state.editor_mode = "sprite"
     state.sprite_name = name
-    state.cells.clear()
     state.frames = [SpriteFrame()]
     state.current_frame = 0
+    state.cells = state.frames[0].cells
     state.canvas_width = width
     state.canvas_height = height
     state.cursor_x = 0
@@ -1362,7 +1369,7 @@ def create_scene(args: str):
     width, height = ROOT_WIDTH, ROOT_HEIGHT - STATUS_HEIGHT
 
     if args:
-        match = re.match(r'(\d+)x(\d+)', args.lower())
+        match = SIZE_RE.match(args.lower())
         if match:
             width = int(match.group(1))
             height = int(match.group(2))
@@ -1374,9 +1381,9 @@ def create_scene(args: str):
     # Reset state for new scene
     state.editor_mode = "scene"
     state.sprite_name = ""
-    state.cells.clear()
     state.frames = [SpriteFrame()]  # Single frame for scene
     state.current_frame = 0
+    state.cells = state.frames[0].cells
     state.canvas_width = width
     state.canvas_height = height
     state.cursor_x = 0
@@ -1386,8 +1393,8 @@ def create_scene(args: str):
     state.current_fg = DEFAULT_FG
 
     # Clear scene-specific state
-    state.sprite_library.clear()
-    state.sprite_instances.clear()
+    state.clear_library()
+    state.clear_instances()
     state.scene_tool = "char"
     state.selected_library_sprite = None
     state.instance_counter = 0
@@ -1405,13 +1412,13 @@ def handle_frame_command(args: str):
     if not args:
         # Add new frame
         # Save current cells to current frame
-        state.frames[state.current_frame].cells = dict(state.cells)
+        state.frames[state.current_frame].cells = state.cells
 
         # Create new frame
         new_frame = SpriteFrame()
         state.frames.append(new_frame)
         state.current_frame = len(state.frames) - 1
-        state.cells.clear()
+        state.cells = new_frame.cells
         state.modified = True
 
         state.set_status(f"Added frame {state.current_frame + 1} (total: {len(state.frames)})")
@@ -1421,11 +1428,11 @@ def handle_frame_command(args: str):
         frame_num = int(args) - 1  # 1-indexed for user
         if 0 <= frame_num < len(state.frames):
             # Save current frame
-            state.frames[state.current_frame].cells = dict(state.cells)
+            state.frames[state.current_frame].cells = state.cells
 
             # Load target frame
             state.current_frame = frame_num
-            state.cells = dict(state.frames[frame_num].cells)
+            state.cells = state.frames[frame_num].cells
 
             state.set_status(f"Frame {frame_num + 1}/{len(state.frames)}")
         else:
@@ -1477,7 +1484,7 @@ def handle_delframe_command(args: str):
         state.current_frame = len(state.frames) - 1
 
     # Load the current frame's cells
-    state.cells = dict(state.frames[state.current_frame].cells)
+    state.cells = state.frames[state.current_frame].cells
     state.modified = True
     state.set_status(f"Deleted frame {frame_num + 1} (now {len(state.frames)} frames)")
 
@@ -1488,11 +1495,9 @@ def handle_anim_command(args: str):
 
     if not args:
         # Open animation editor
-        state.mode = EditorMode.ANIMATION_EDITOR
+        enter_modal_screen(EditorMode.ANIMATION_EDITOR)
         state.anim_editor_mode = "list"
         state.anim_editor_cursor = 0
-        models.sprite_win.visible = False
-        models.status_win.visible = False
 
     elif args.startswith('new '):
         # Create new animation with given name
@@ -1598,29 +1603,45 @@ def load_sprite_library(path: str, base_dir: Optional[str] = None) -> bool:
         rel_path = path
 
     try:
-        with open(full_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Skip re-executing a file that hasn't changed since it was loaded
+        st = os.stat(full_path)
+        mtime = st.st_mtime
+        entry = state.sprite_library.get(rel_path)
+        if entry is not None and entry.loaded_mtime == mtime:
+            state.set_status(f"Imported: {rel_path} ({len(entry.sprite_names)} sprites)")
+            return True
+
+        sprite_defs = read_sprite_defs_cache(full_path, st)
+        if sprite_defs is None:
+            with open(full_path, 'r', encoding='utf-8') as f:
+                content = f.read()
 
-        # Execute the file to extract SPRITE_DEFS
-        # Include pyunicodegame and pygame in namespace since sprite files import them
-        namespace = {'pyunicodegame': pyunicodegame, 'pygame': pygame}
-        exec(content, namespace)
+            # Execute the file to extract SPRITE_DEFS
+            # Include pyunicodegame and pygame in namespace since sprite files import them
+            namespace = {'pyunicodegame': pyunicodegame, 'pygame': pygame}
+            exec(content, namespace)
 
-        if 'SPRITE_DEFS' not in namespace:
-            state.set_status(f"No SPRITE_DEFS in {path}")
-            return False
+            if 'SPRITE_DEFS' not in namespace:
+                state.set_status(f"No SPRITE_DEFS in {path}")
+                return False
+
+            sprite_defs = namespace['SPRITE_DEFS']
+            write_sprite_defs_cache(full_path, st, sprite_defs)
 
-        sprite_defs = namespace['SPRITE_DEFS']
         sprite_names = list(sprite_defs.keys())
 
         # Create library entry
         entry = SpriteLibraryEntry(
             file_path=rel_path,
             sprite_names=sprite_names,
-            sprite_defs=sprite_defs
+            sprite_defs=sprite_defs,
+            loaded_mtime=mtime
         )
+        entry.index_animations()
+        entry.index_previews()
+        entry.index_colors()
 
-        state.sprite_library[rel_path] = entry
+        state.add_library(rel_path, entry)
         state.set_status(f"Imported: {rel_path} ({len(sprite_names)} sprites)")
         return True
 
@@ -1636,41 +1657,56 @@ def unload_sprite_library(path: str):
     """Remove a sprite library from the loaded set."""
     if path in state.sprite_library:
         # Remove any instances using sprites from this library
-        to_remove = [
-            inst_id for inst_id, inst in state.sprite_instances.items()
-            if inst.library_key.startswith(path + ":")
-        ]
-        for inst_id in to_remove:
-            del state.sprite_instances[inst_id]
-
-        del state.sprite_library[path]
+        for inst_id in list(state.instances_by_lib.get(path, ())):
+            state.remove_instance(inst_id)
+
+        state.remove_library(path)
         state.set_status(f"Unloaded: {path}")
     else:
         state.set_status(f"Library not loaded: {path}")
 
 
-def create_scene_sprite(sprite_def: dict, x: int, y: int, initial_animation: Optional[str] = None):
-    """Create a pyunicodegame sprite from a library sprite definition."""
-    frames_data = sprite_def.get('frames', [{}])
-    default_fg = tuple(sprite_def.get('default_fg', (255, 255, 255)))
-    animations_data = sprite_def.get('animations', {})
+# Shared defaults for create_scene_sprite, so missing keys don't allocate
+# fresh empty containers per frame per instance
+_EMPTY_2D = ((' ',),)
+_EMPTY_COLORS = ((None,),)
+_EMPTY_FRAMES = ({},)
+_EMPTY_ANIMATIONS = {}
+_default_empty_frame = None
+
+
+def get_default_empty_frame():
+    """Get the shared blank pyunicodegame frame (treated as immutable)."""
+    global _default_empty_frame
+    if _default_empty_frame is None:
+        _default_empty_frame = pyunicodegame.SpriteFrame([[' ']], [[None]])
+    return _default_empty_frame
+
+
+def create_scene_sprite(sprite_def: dict, x: int, y: int, initial_animation: Optional[str] = None,
+                        default_fg: Optional[Tuple[int, int, int]] = None):
+    """Create a pyunicodegame sprite from a library sprite definition.
+
+    default_fg is the library entry's pre-normalized color; sprite_def is only read.
+    """
+    frames_data = sprite_def.get('frames') or _EMPTY_FRAMES
+    if default_fg is None:
+        default_fg = normalize_color(sprite_def.get('default_fg', DEFAULT_FG))
+    animations_data = sprite_def.get('animations') or _EMPTY_ANIMATIONS
 
     # Build pyunicodegame frames
     pug_frames = []
     for frame_data in frames_data:
         if 'chars' in frame_data:
             # 2D array format
-            chars = frame_data.get('chars', [[]])
-            fg_colors = frame_data.get('fg_colors', [[]])
+            chars = frame_data.get('chars') or _EMPTY_2D
+            fg_colors = frame_data.get('fg_colors') or _EMPTY_COLORS
             pug_frame = pyunicodegame.SpriteFrame(chars, fg_colors)
         else:
             # Empty frame
-            pug_frame = pyunicodegame.SpriteFrame([[' ']], [[None]])
+            pug_frame = get_default_empty_frame()
         pug_frames.append(pug_frame)
 
-    if not pug_frames:
-        pug_frames = [pyunicodegame.SpriteFrame([[' ']], [[None]])]
-
     # Create the sprite
     sprite = pyunicodegame.Sprite(pug_frames, fg=default_fg)
     sprite.x = x
@@ -1716,20 +1752,29 @@ def get_canvas_offset():
     return sx, sy
 
 
-def add_scene_preview_sprite(instance_id: str, instance: SpriteInstance):
-    """Create and add a preview sprite for a placed instance."""
-    lib_path = instance.library_key.split(':')[0]
-    sprite_name = instance.library_key.split(':')[1]
+def build_scene_preview_sprite(instance: SpriteInstance):
+    """Create the preview sprite for a placed instance (None if its library is gone)."""
+    lib_path = instance.lib_path
+    sprite_name = instance.sprite_name
 
     if lib_path not in state.sprite_library:
-        return
+        return None
 
-    sprite_def = state.sprite_library[lib_path].sprite_defs.get(sprite_name, {})
+    entry = state.sprite_library[lib_path]
+    sprite_def = entry.sprite_defs.get(sprite_name, {})
     if not sprite_def:
-        return
+        return None
 
     # Create the pyunicodegame sprite at canvas-relative position
-    sprite = create_scene_sprite(sprite_def, instance.x, instance.y, instance.initial_animation)
+    return create_scene_sprite(sprite_def, instance.x, instance.y, instance.initial_animation,
+                               entry.default_fgs.get(sprite_name))
+
+
+def add_scene_preview_sprite(instance_id: str, instance: SpriteInstance):
+    """Create and add a preview sprite for a placed instance."""
+    sprite = build_scene_preview_sprite(instance)
+    if sprite is None:
+        return
 
     # Add to sprite window (not root)
     if models.sprite_win:
@@ -1750,12 +1795,19 @@ def remove_scene_preview_sprite(instance_id: str):
 def refresh_all_scene_sprites():
     """Recreate all scene preview sprites (e.g., after loading a scene)."""
     # Remove existing preview sprites
-    for instance_id in list(state.scene_preview_sprites.keys()):
-        remove_scene_preview_sprite(instance_id)
+    if models.sprite_win:
+        remove_sprite = models.sprite_win.remove_sprite
+        for sprite in state.scene_preview_sprites.values():
+            remove_sprite(sprite)
+    state.scene_preview_sprites.clear()
 
     # Create new ones for all instances
     for instance_id, instance in state.sprite_instances.items():
-        add_scene_preview_sprite(instance_id, instance)
+        sprite = build_scene_preview_sprite(instance)
+        if sprite is not None:
+            state.scene_preview_sprites[instance_id] = sprite
+            if models.sprite_win:
+                models.sprite_win.add_sprite(sprite)
 
 
 def place_sprite_at_cursor():
@@ -1764,9 +1816,8 @@ def place_sprite_at_cursor():
         state.set_status("No sprite selected - press S to select")
         return
 
-    library_key = state.selected_library_sprite
-    lib_path = library_key.split(':')[0]
-    sprite_name = library_key.split(':')[1]
+    library_key = sys.intern(state.selected_library_sprite)
+    lib_path, sprite_name = split_library_key(library_key)
 
     # Check library is still loaded
     if lib_path not in state.sprite_library:
@@ -1787,7 +1838,7 @@ def place_sprite_at_cursor():
         initial_animation=None
     )
 
-    state.sprite_instances[instance_id] = instance
+    state.add_instance(instance)
 
     # Create preview sprite
     add_scene_preview_sprite(instance_id, instance)
@@ -1798,47 +1849,40 @@ def place_sprite_at_cursor():
 
 def delete_sprite_at_cursor():
     """Delete any sprite instance at the cursor position"""
-    # Find sprite at cursor
-    for instance_id, instance in list(state.sprite_instances.items()):
-        # Get sprite dimensions
-        lib_path = instance.library_key.split(':')[0]
-        sprite_name = instance.library_key.split(':')[1]
-
-        if lib_path in state.sprite_library:
-            sprite_def = state.sprite_library[lib_path].sprite_defs.get(sprite_name, {})
-            w = sprite_def.get('width', 1)
-            h = sprite_def.get('height', 1)
-        else:
-            w, h = 1, 1
-
-        # Check if cursor is within sprite bounds
-        if (instance.x <= state.cursor_x < instance.x + w and
-            instance.y <= state.cursor_y < instance.y + h):
-            # Remove preview sprite
-            remove_scene_preview_sprite(instance_id)
-            del state.sprite_instances[instance_id]
-            state.modified = True
-            state.set_status(f"Deleted: {instance_id}")
-            return
+    instance = get_sprite_at_cursor()
+    if instance is None:
+        state.set_status("No sprite at cursor")
+        return
 
-    state.set_status("No sprite at cursor")
+    instance_id = instance.instance_id
+    # Remove preview sprite
+    remove_scene_preview_sprite(instance_id)
+    state.remove_instance(instance_id)
+    state.modified = True
+    state.set_status(f"Deleted: {instance_id}")
 
 
 def get_sprite_at_cursor() -> Optional[SpriteInstance]:
     """Get sprite instance at cursor position, if any"""
-    for instance_id, instance in state.sprite_instances.items():
-        lib_path = instance.library_key.split(':')[0]
-        sprite_name = instance.library_key.split(':')[1]
-
-        if lib_path in state.sprite_library:
-            sprite_def = state.sprite_library[lib_path].sprite_defs.get(sprite_name, {})
-            w = sprite_def.get('width', 1)
-            h = sprite_def.get('height', 1)
-        else:
-            w, h = 1, 1
+    library = state.sprite_library
+    cx, cy = state.cursor_x, state.cursor_y
+    dims_cache = {}
+
+    for instance in state.sprite_instances.values():
+        key = instance.library_key
+        dims = dims_cache.get(key)
+        if dims is None:
+            # Resolve each sprite's size once per scan
+            entry = library.get(instance.lib_path)
+            if entry is not None:
+                sprite_def = entry.sprite_defs.get(instance.sprite_name, {})
+                dims = (sprite_def.get('width', 1), sprite_def.get('height', 1))
+            else:
+                dims = (1, 1)
+            dims_cache[key] = dims
 
-        if (instance.x <= state.cursor_x < instance.x + w and
-            instance.y <= state.cursor_y < instance.y + h):
+        x, y = instance.x, instance.y
+        if x <= cx < x + dims[0] and y <= cy < y + dims[1]:
             return instance
 
     return None
@@ -1846,31 +1890,23 @@ def get_sprite_at_cursor() -> Optional[SpriteInstance]:
 
 def cycle_sprite_animation(instance: SpriteInstance):
     """Cycle to the next animation for a sprite instance"""
-    lib_path = instance.library_key.split(':')[0]
-    sprite_name = instance.library_key.split(':')[1]
+    lib_path = instance.lib_path
+    sprite_name = instance.sprite_name
 
     if lib_path not in state.sprite_library:
         state.set_status("Sprite library not loaded")
         return
 
-    sprite_def = state.sprite_library[lib_path].sprite_defs.get(sprite_name, {})
-    animations = sprite_def.get('animations', {})
+    entry = state.sprite_library[lib_path]
+    anim_names = entry.anim_names.get(sprite_name)
 
-    if not animations:
+    if not anim_names:
         state.set_status(f"{sprite_name} has no animations")
         return
 
-    anim_names = list(animations.keys())
-    current = instance.initial_animation
-
-    if current is None or current not in anim_names:
-        # Set to first animation
-        instance.initial_animation = anim_names[0]
-    else:
-        # Cycle to next
-        idx = anim_names.index(current)
-        next_idx = (idx + 1) % len(anim_names)
-        instance.initial_animation = anim_names[next_idx]
+    # Unknown or unset animation falls back to the first one
+    instance.initial_animation = entry.anim_next[sprite_name].get(
+        instance.initial_animation, anim_names[0])
 
     state.modified = True
     state.set_status(f"{instance.instance_id}: {instance.initial_animation}")
@@ -1888,6 +1924,10 @@ def update(dt: float):
         state.cursor_blink_timer = 0
         state.cursor_visible = not state.cursor_visible
 
+    # Nothing else ticks when idle (no playback, no pending status message)
+    if not state.animation_playing and state.status_message_time <= 0:
+        return
+
     # In preview mode, pyunicodegame handles sprite updates automatically in its run loop
     if state.mode == EditorMode.ANIMATION_PREVIEW:
         # Still decay status message
@@ -1900,22 +1940,19 @@ def update(dt: float):
     # Update animation playback
     if state.animation_playing and len(state.frames) > 1:
         # Determine frame duration
-        frame_duration = 0.2  # Default
-        if state.current_animation and state.current_animation in state.animations:
-            anim = state.animations[state.current_animation]
-            frame_duration = anim.frame_duration
+        anim = state.animations.get(state.current_animation) if state.current_animation else None
+        frame_duration = anim.frame_duration if anim is not None else 0.2  # Default
 
         state.animation_timer += dt
         if state.animation_timer >= frame_duration:
             state.animation_timer = 0
 
             # Save current frame
-            state.frames[state.current_frame].cells = dict(state.cells)
+            state.frames[state.current_frame].cells = state.cells
 
             # Advance to next frame
-            if state.current_animation and state.current_animation in state.animations:
+            if anim is not None:
                 # Use animation's frame sequence
-                anim = state.animations[state.current_animation]
                 state.animation_frame_idx = (state.animation_frame_idx + 1) % len(anim.frames)
                 anim_frame = anim.frames[state.animation_frame_idx]
                 state.current_frame = anim_frame.frame_index % len(state.frames)
@@ -1924,7 +1961,7 @@ def update(dt: float):
                 state.current_frame = (state.current_frame + 1) % len(state.frames)
 
             # Load new frame
-            state.cells = dict(state.frames[state.current_frame].cells)
+            state.cells = state.frames[state.current_frame].cells
 
     # Note: Scene sprite updates are handled automatically by pyunicodegame's run loop
 
@@ -1971,7 +2008,7 @@ def main():
 
     for arg in sys.argv[1:]:
         # Check for dimension argument (WxH)
-        match = re.match(r'^(\d+)x(\d+)$', arg.lower())
+        match = SIZE_RE.fullmatch(arg.lower())
         if match:
             canvas_w = int(match.group(1))
             canvas_h = int(match.group(2))
@@ -4,6 +4,9 @@ Sprite & Scene Editor - File I/O functions
 
 import os
 import sys
+import hashlib
+import pickle
+from typing import Optional
 import pygame
 import pyunicodegame
 
@@ -12,18 +15,69 @@ try:
     from .models import (
         state,
         DEFAULT_CANVAS_WIDTH, DEFAULT_CANVAS_HEIGHT, DEFAULT_FG,
-        Cell, SpriteFrame, AnimationFrame, AnimationDef, SpriteInstance,
+        Cell, SpriteFrame, AnimationDef, SpriteInstance,
+        normalize_color,
     )
 except ImportError:
     import models
     from models import (
         state,
         DEFAULT_CANVAS_WIDTH, DEFAULT_CANVAS_HEIGHT, DEFAULT_FG,
-        Cell, SpriteFrame, AnimationFrame, AnimationDef, SpriteInstance,
+        Cell, SpriteFrame, AnimationDef, SpriteInstance,
+        normalize_color,
     )
 
 
 GENERATED_DIR = "generated_files"
+SPRITE_CACHE_FORMAT = 1  # Bump when the cached layout changes
+
+
+def sprite_defs_cache_path(path: str) -> str:
+    """Per-user cache file for a sprite file's SPRITE_DEFS.
+
+    Kept under the user's cache directory rather than next to the sprite,
+    so nothing is written into (or unpickled from) shared sprite folders.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(base, 'fancyunicode', 'sprite_defs', digest + '.pickle')
+
+
+def _sprite_defs_cache_header(path: str, st: os.stat_result) -> tuple:
+    return (SPRITE_CACHE_FORMAT, sys.version_info[:2], os.path.abspath(path),
+            st.st_mtime_ns, st.st_size)
+
+
+def read_sprite_defs_cache(path: str, st: os.stat_result) -> Optional[dict]:
+    """Return cached SPRITE_DEFS for a sprite file, or None if missing or stale.
+
+    Only the sprite file's own (mtime_ns, size) is checked: if its SPRITE_DEFS
+    is built from other files it imports, editing those will not invalidate
+    the cache (touch the sprite file to force a reload).
+    """
+    try:
+        with open(sprite_defs_cache_path(path), 'rb') as f:
+            if pickle.load(f) != _sprite_defs_cache_header(path, st):
+                return None
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def write_sprite_defs_cache(path: str, st: os.stat_result, sprite_defs: dict):
+    """Write the pickled SPRITE_DEFS cache for a sprite file (best effort)."""
+    cache_path = sprite_defs_cache_path(path)
+    try:
+        os.makedirs(os.path.dirname(cache_path), mode=0o700, exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            pickle.dump(_sprite_defs_cache_header(path, st), f, protocol=5)
+            pickle.dump(sprite_defs, f, protocol=5)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        # An unwritable cache dir or unpicklable defs just mean no cache
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
 
 
 def save_file(path: str):
@@ -39,7 +93,7 @@ def save_file(path: str):
     try:
         # Save current cells to current frame before saving
         if state.editor_mode == "sprite":
-            state.frames[state.current_frame].cells = dict(state.cells)
+            state.frames[state.current_frame].cells = state.cells
             code = generate_sprite_code(os.path.basename(path))
         else:
             code = generate_scene_code(os.path.basename(path))
@@ -77,6 +131,11 @@ def generate_sprite_code(filename: str) -> str:
     lines.append(f"        'default_fg': {state.current_fg},")
     lines.append("        'frames': [")
 
+    # Blank rows are common, so format them once and detect them with C-level counts
+    width = state.canvas_width
+    blank_chars_line = "                    [" + ', '.join([repr(' ')] * width) + "],"
+    blank_fg_line = "                    [" + ', '.join(['None'] * width) + "],"
+
     # Add each frame
     for frame_idx, frame in enumerate(state.frames):
         frame_dict = frame.to_dict(state.canvas_width, state.canvas_height)
@@ -85,6 +144,9 @@ def generate_sprite_code(filename: str) -> str:
         # Format chars as 2D array
         lines.append("                'chars': [")
         for row in frame_dict['chars']:
+            if row.count(' ') == width:
+                lines.append(blank_chars_line)
+                continue
             row_repr = '[' + ', '.join(repr(c) for c in row) + ']'
             lines.append(f"                    {row_repr},")
         lines.append("                ],")
@@ -92,6 +154,9 @@ def generate_sprite_code(filename: str) -> str:
         # Format fg_colors (only include non-None values for readability)
         lines.append("                'fg_colors': [")
         for row in frame_dict['fg_colors']:
+            if row.count(None) == width:
+                lines.append(blank_fg_line)
+                continue
             row_repr = '[' + ', '.join(str(c) if c else 'None' for c in row) + ']'
             lines.append(f"                    {row_repr},")
         lines.append("                ],")
@@ -182,7 +247,7 @@ def generate_scene_code(filename: str) -> str:
     # Collect unique library paths used by sprite instances
     used_libraries = set()
     for instance in state.sprite_instances.values():
-        lib_path = instance.library_key.split(':')[0]
+        lib_path = instance.lib_path
         used_libraries.add(lib_path)
 
     # Generate imports for sprite libraries
@@ -243,8 +308,8 @@ def generate_scene_code(filename: str) -> str:
     if state.sprite_instances:
         lines.append('')
         for instance_id, instance in sorted(state.sprite_instances.items()):
-            lib_path = instance.library_key.split(':')[0]
-            sprite_name = instance.library_key.split(':')[1]
+            lib_path = instance.lib_path
+            sprite_name = instance.sprite_name
             module_name = lib_imports.get(lib_path, 'unknown')
 
             lines.append(f"    # {instance_id}")
@@ -394,18 +459,14 @@ def load_file(path: str, setup_sprite_window_func, load_sprite_library_func, ref
         state.canvas_height = meta.get('height', DEFAULT_CANVAS_HEIGHT)
 
         # Load cells (support both old 'cells' and new 'char_placements' key)
-        state.cells.clear()
         cell_data_dict = meta.get('char_placements', meta.get('cells', {}))
-        for (x, y), cell_data in cell_data_dict.items():
-            cell = Cell(
-                char=cell_data['char'],
-                fg=tuple(cell_data['fg']),
-                bg=tuple(cell_data['bg']) if cell_data.get('bg') else None
-            )
-            state.cells[(x, y)] = cell
+        cells = {pos: Cell.from_dict(cell_data) for pos, cell_data in cell_data_dict.items()}
+        state.frames = [SpriteFrame(cells=cells)]  # Single frame for scene
+        state.current_frame = 0
+        state.cells = cells
 
         # Load sprite library files (relative to scene file)
-        state.sprite_library.clear()
+        state.clear_library()
         scene_dir = os.path.dirname(os.path.abspath(path))
         for lib_path in meta.get('sprite_library', []):
             full_path = os.path.join(scene_dir, lib_path) if not os.path.isabs(lib_path) else lib_path
@@ -415,17 +476,17 @@ def load_file(path: str, setup_sprite_window_func, load_sprite_library_func, ref
                 state.set_status(f"Warning: library not found: {lib_path}")
 
         # Load sprite instances
-        state.sprite_instances.clear()
+        state.clear_instances()
         state.instance_counter = 0
         for instance_id, inst_data in meta.get('sprite_instances', {}).items():
             instance = SpriteInstance(
-                library_key=inst_data['library_key'],
+                library_key=sys.intern(inst_data['library_key']),
                 instance_id=instance_id,
                 x=inst_data['x'],
                 y=inst_data['y'],
                 initial_animation=inst_data.get('initial_animation')
             )
-            state.sprite_instances[instance_id] = instance
+            state.add_instance(instance)
             # Track highest instance counter
             try:
                 num = int(instance_id.split('_')[-1])
@@ -471,7 +532,7 @@ def load_sprite_from_defs(path: str, sprite_defs: dict, setup_sprite_window_func
     state.sprite_name = sprite_name
     state.canvas_width = defn.get('width', 8)
     state.canvas_height = defn.get('height', 6)
-    state.current_fg = tuple(defn.get('default_fg', DEFAULT_FG))
+    state.current_fg = normalize_color(defn.get('default_fg', DEFAULT_FG))
 
     # Recreate sprite window with loaded dimensions
     setup_sprite_window_func()
@@ -489,20 +550,11 @@ def load_sprite_from_defs(path: str, sprite_defs: dict, setup_sprite_window_func
     state.animations.clear()
     if 'animations' in defn:
         for anim_name, anim_data in defn['animations'].items():
-            anim_frames = [
-                AnimationFrame(frame_index=f[0], offset_x=f[1], offset_y=f[2])
-                for f in anim_data.get('frames', [])
-            ]
-            state.animations[anim_name] = AnimationDef(
-                name=anim_name,
-                frames=anim_frames,
-                frame_duration=anim_data.get('frame_duration', 0.2),
-                loop=anim_data.get('loop', True),
-            )
+            state.animations[anim_name] = AnimationDef.from_dict(anim_name, anim_data)
 
     # Load first frame into cells
     state.current_frame = 0
-    state.cells = dict(state.frames[0].cells)
+    state.cells = state.frames[0].cells
 
     state.file_path = path
     state.modified = False
@@ -2,10 +2,12 @@
 Sprite & Scene Editor - Data models, constants, and global state
 """
 
+import sys
 import pygame
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Dict, Tuple, Optional, List, Any
+from functools import lru_cache
+from typing import Dict, Tuple, Optional, List, Any, Set
 
 
 # ============================================================================
@@ -52,42 +54,54 @@ COLOR_PALETTE_FG = [
     (150, 150, 150),  # Gray
 ]
 
+# Box drawing runs shared by several categories
+_BOX_LIGHT = '─│┌┐└┘├┤┬┴┼'
+_BOX_HEAVY = '━┃┏┓┗┛┣┫┳┻╋'
+_BOX_DOUBLE = '═║╔╗╚╝╠╣╦╩╬'
+_BOX_ROUND_CORNERS = '╭╮╯╰'
+
+
+def _palette(*parts) -> Tuple[str, ...]:
+    """Flatten strings/iterables of chars into one tuple of interned chars."""
+    return tuple(sys.intern(c) for part in parts for c in part)
+
+
 # Character palette categories (name, characters) - each should have 41+ entries for shift support
 PALETTE_CATEGORIES = [
     ('Recent', []),  # Populated dynamically
     # Box drawing - combine related sets (41+ each)
-    ('Box Light', list('─│┌┐└┘├┤┬┴┼╌╎┄┆┈┊') + [chr(0x2500 + i) for i in range(40, 64)]),
-    ('Box Heavy', list('━┃┏┓┗┛┣┫┳┻╋╍╏┅┇┉┋') + [chr(0x2500 + i) for i in range(56, 80)]),
-    ('Box Double', list('═║╔╗╚╝╠╣╦╩╬') + [chr(0x2550 + i) for i in range(11, 44)]),
-    ('Box Round', list('╭╮╯╰') + list('─│┌┐└┘├┤┬┴┼━┃┏┓┗┛┣┫┳┻╋═║╔╗╚╝╠╣╦╩╬╌╍╎╏')),
-    ('Box Mixed', list('╒╓╔╕╖╗╘╙╚╛╜╝╞╟╠╡╢╣╤╥╦╧╨╩╪╫╬') + list('╭╮╯╰─│┌┐└┘├┤┬┴┼')),
+    ('Box Light', _palette(_BOX_LIGHT, '╌╎┄┆┈┊', (chr(0x2500 + i) for i in range(40, 64)))),
+    ('Box Heavy', _palette(_BOX_HEAVY, '╍╏┅┇┉┋', (chr(0x2500 + i) for i in range(56, 80)))),
+    ('Box Double', _palette(_BOX_DOUBLE, (chr(0x2550 + i) for i in range(11, 44)))),
+    ('Box Round', _palette(_BOX_ROUND_CORNERS, _BOX_LIGHT, _BOX_HEAVY, _BOX_DOUBLE, '╌╍╎╏')),
+    ('Box Mixed', _palette('╒╓╔╕╖╗╘╙╚╛╜╝╞╟╠╡╢╣╤╥╦╧╨╩╪╫╬', _BOX_ROUND_CORNERS, _BOX_LIGHT)),
     # Block elements - extend with more
-    ('Blocks', list('▀▁▂▃▄▅▆▇█▉▊▋▌▍▎▏░▒▓') + [chr(0x2580 + i) for i in range(20, 32)] + list('▖▗▘▙▚▛▜▝▞▟')),
-    ('Quadrants', list('▖▗▘▙▚▛▜▝▞▟') + list('░▒▓█▀▄▌▐▬▭▮▯▰▱◼◻◾◽■□▢▣▤▥▦▧▨▩▪▫▰▱')),
+    ('Blocks', _palette('▀▁▂▃▄▅▆▇█▉▊▋▌▍▎▏░▒▓', (chr(0x2580 + i) for i in range(20, 32)), '▖▗▘▙▚▛▜▝▞▟')),
+    ('Quadrants', _palette('▖▗▘▙▚▛▜▝▞▟', '░▒▓█▀▄▌▐▬▭▮▯▰▱◼◻◾◽■□▢▣▤▥▦▧▨▩▪▫▰▱')),
     # Geometric shapes - extend ranges
-    ('Geometric', list('■□▢▣▤▥▦▧▨▩●○◐◑◒◓◔◕◖◗◘◙◚◛◜◝◞◟◠◡◢◣◤◥◦◧◨◩◪◫◬◭◮')),
-    ('Triangles', list('▲△▴▵▶▷▸▹►▻◀◁◂◃◄◅▼▽▾▿') + list('◢◣◤◥◸◹◺◿◁▷◅▻◄►⏴⏵⏶⏷🔺🔻🔼🔽')),
-    ('Diamonds', list('◆◇◈◊❖⬥⬦⬧⬨◇◆') + list('⬩⬪⬫⬬⬭⬮⬯⟐⟡⧫⧪⧩⧨') + list('♦♢🔶🔷🔸🔹💎💠◈◊❖') + list('⯁⯂⟠⟡⬖⬗⬘⬙')),
-    ('Stars', list('★☆✦✧✩✪✫✬✭✮✯✰✱✲✳✴✵✶✷✸✹') + list('✺✻✼✽✾✿❀❁❂❃❄❅❆❇❈❉❊❋⭐⭑⭒')),
-    ('Arrows', list('←↑→↓↔↕↖↗↘↙↚↛↜↝↞↟↠↡↢↣↤↥↦↧↨↩↪↫↬↭↮↯↰↱↲↳↴↵↶↷↸↹')),
-    ('Math', list('±×÷≠≤≥≈∞∑∏√∫∂∇∈∉∩∪⊂⊃⊄⊅⊆⊇⊈⊉⊊⊋∀∃∄∅∆∇∴∵∷∸∼∽∾∿')),
-    ('Greek', list('αβγδεζηθικλμνξοπρστυφχψωΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ')),
-    ('Symbols', list('♠♡♢♣♤♥♦♧♔♕♖♗♘♙♚♛♜♝♞♟') + list('☮☯☸☠☢☣⚛⚔⚖⚗⚙⚚⚜⚝⚠⚡⚢⚣⚤⚥⚦')),
-    ('Music', list('♩♪♫♬♭♮♯𝄞𝄢') + [chr(0x1D100 + i) for i in range(32)] + list('🎵🎶🎷🎸🎹🎺🎻')),
-    ('Weather', list('☀☁☂☃☄☽☾⛅⛈') + list('🌤🌥🌦🌧🌨🌩🌪🌫🌬❄☔⚡🌡🌈🌀🌊💧💨🔥⛄☃️🌞🌝🌚🌑🌒🌓🌔🌕🌖🌗🌘')),
-    ('Zodiac', list('♈♉♊♋♌♍♎♏♐♑♒♓') + list('⛎☉☽♁♃♄♅♆♇☿♀♂⚳⚴⚵⚶⚷⚸⚹⚺⚻⚼⛢☊☋☌☍⚕⚘⚚⚛')),
-    ('Misc', list('·•°※†‡§¶©®™℃℉№℗℠℡™⁂⁃⁄⁒⁓⁕⁖⁘⁙⁚⁛⁜⁝⁞‖‗†‡•‣․‥…‧‰‱′″‴‵‶‷')),
-    ('Braille', [chr(0x2800 + i) for i in range(80)]),
-    ('Sextants', [chr(0x1FB00 + i) for i in range(48)]),
-    ('Wedges', [chr(0x1FB3C + i) for i in range(44)]),
-    ('Octants', [chr(0x1CC00 + i) for i in range(80)]),
-    ('Legacy', [chr(0x1CC00 + (i * 704 // 81)) for i in range(81)]),  # Legacy Computing Supplement spread
-    ('Lines', list('╱╲╳⌒⌓─━│┃╌╍╎╏┄┅┆┇┈┉┊┋') + list('⎯⎸⎹⎺⎻⎼⎽─━│┃┄┅┆┇┈┉┊┋╌╍╎╏—–―‾')),
-    ('Dingbats', [chr(0x2700 + i) for i in range(80)]),
-    ('Emoji Face', list('😀😁😂🤣😃😄😅😆😉😊😋😎😍😘🥰😗😙🥲😚☺😌😛😜🤪😝🤑🤗🤭🤫🤔🤐🤨😐😑😶🫥😏😒🙄😬😮😯')),
-    ('Emoji Hand', list('👍👎👌✌🤞🤟🤙👋🖐✋👏🙌🤲🙏🤝💪🦾🖕✍🤳💅🦵🦶👂🦻👃👶🧒👦👧🧑👱👀👁👃👄💋🦷🦴💀☠')),
-    ('Animals', list('🐀🐁🐂🐃🐄🐅🐆🐇🐈🐉🐊🐋🐌🐍🐎🐏🐐🐑🐒🐓🐔🐕🐖🐗🐘🐙🐚🐛🐜🐝🐞🐟🐠🐡🐢🐣🐤🐥🐦🐧🐨🐩🐪🐫🐬🐭🐮🐯🐰🐱🐲🐳🐴🐵🐶🐷🐸🐹🐺🐻🐼🐽🐾🦁🦂🦃🦄🦅🦆🦇🦈🦉🦊🦋🦌🦍🦎🦏🦐')),
-    ('Plants', list('🌲🌳🌴🌵🌷🌸🌹🌺🌻🌼🌽🌾🌿🍀🍁🍂🍃🍄🍅🍆🍇🍈🍉🍊🍋🍌🍍🍎🍏🍐🍑🍒🍓🥝🥥🥑🥔🥕🥒🌶🥬🥦')),
+    ('Geometric', _palette('■□▢▣▤▥▦▧▨▩●○◐◑◒◓◔◕◖◗◘◙◚◛◜◝◞◟◠◡◢◣◤◥◦◧◨◩◪◫◬◭◮')),
+    ('Triangles', _palette('▲△▴▵▶▷▸▹►▻◀◁◂◃◄◅▼▽▾▿', '◢◣◤◥◸◹◺◿◁▷◅▻◄►⏴⏵⏶⏷🔺🔻🔼🔽')),
+    ('Diamonds', _palette('◆◇◈◊❖⬥⬦⬧⬨◇◆', '⬩⬪⬫⬬⬭⬮⬯⟐⟡⧫⧪⧩⧨', '♦♢🔶🔷🔸🔹💎💠◈◊❖', '⯁⯂⟠⟡⬖⬗⬘⬙')),
+    ('Stars', _palette('★☆✦✧✩✪✫✬✭✮✯✰✱✲✳✴✵✶✷✸✹', '✺✻✼✽✾✿❀❁❂❃❄❅❆❇❈❉❊❋⭐⭑⭒')),
+    ('Arrows', _palette('←↑→↓↔↕↖↗↘↙↚↛↜↝↞↟↠↡↢↣↤↥↦↧↨↩↪↫↬↭↮↯↰↱↲↳↴↵↶↷↸↹')),
+    ('Math', _palette('±×÷≠≤≥≈∞∑∏√∫∂∇∈∉∩∪⊂⊃⊄⊅⊆⊇⊈⊉⊊⊋∀∃∄∅∆∇∴∵∷∸∼∽∾∿')),
+    ('Greek', _palette('αβγδεζηθικλμνξοπρστυφχψωΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ')),
+    ('Symbols', _palette('♠♡♢♣♤♥♦♧♔♕♖♗♘♙♚♛♜♝♞♟', '☮☯☸☠☢☣⚛⚔⚖⚗⚙⚚⚜⚝⚠⚡⚢⚣⚤⚥⚦')),
+    ('Music', _palette('♩♪♫♬♭♮♯𝄞𝄢', (chr(0x1D100 + i) for i in range(32)), '🎵🎶🎷🎸🎹🎺🎻')),
+    ('Weather', _palette('☀☁☂☃☄☽☾⛅⛈', '🌤🌥🌦🌧🌨🌩🌪🌫🌬❄☔⚡🌡🌈🌀🌊💧💨🔥⛄☃️🌞🌝🌚🌑🌒🌓🌔🌕🌖🌗🌘')),
+    ('Zodiac', _palette('♈♉♊♋♌♍♎♏♐♑♒♓', '⛎☉☽♁♃♄♅♆♇☿♀♂⚳⚴⚵⚶⚷⚸⚹⚺⚻⚼⛢☊☋☌☍⚕⚘⚚⚛')),
+    ('Misc', _palette('·•°※†‡§¶©®™℃℉№℗℠℡™⁂⁃⁄⁒⁓⁕⁖⁘⁙⁚⁛⁜⁝⁞‖‗†‡•‣․‥…‧‰‱′″‴‵‶‷')),
+    ('Braille', _palette(chr(0x2800 + i) for i in range(80))),
+    ('Sextants', _palette(chr(0x1FB00 + i) for i in range(48))),
+    ('Wedges', _palette(chr(0x1FB3C + i) for i in range(44))),
+    ('Octants', _palette(chr(0x1CC00 + i) for i in range(80))),
+    ('Legacy', _palette(chr(0x1CC00 + (i * 704 // 81)) for i in range(81))),  # Legacy Computing Supplement spread
+    ('Lines', _palette('╱╲╳⌒⌓─━│┃╌╍╎╏┄┅┆┇┈┉┊┋', '⎯⎸⎹⎺⎻⎼⎽─━│┃┄┅┆┇┈┉┊┋╌╍╎╏—–―‾')),
+    ('Dingbats', _palette(chr(0x2700 + i) for i in range(80))),
+    ('Emoji Face', _palette('😀😁😂🤣😃😄😅😆😉😊😋😎😍😘🥰😗😙🥲😚☺😌😛😜🤪😝🤑🤗🤭🤫🤔🤐🤨😐😑😶🫥😏😒🙄😬😮😯')),
+    ('Emoji Hand', _palette('👍👎👌✌🤞🤟🤙👋🖐✋👏🙌🤲🙏🤝💪🦾🖕✍🤳💅🦵🦶👂🦻👃👶🧒👦👧🧑👱👀👁👃👄💋🦷🦴💀☠')),
+    ('Animals', _palette('🐀🐁🐂🐃🐄🐅🐆🐇🐈🐉🐊🐋🐌🐍🐎🐏🐐🐑🐒🐓🐔🐕🐖🐗🐘🐙🐚🐛🐜🐝🐞🐟🐠🐡🐢🐣🐤🐥🐦🐧🐨🐩🐪🐫🐬🐭🐮🐯🐰🐱🐲🐳🐴🐵🐶🐷🐸🐹🐺🐻🐼🐽🐾🦁🦂🦃🦄🦅🦆🦇🦈🦉🦊🦋🦌🦍🦎🦏🦐')),
+    ('Plants', _palette('🌲🌳🌴🌵🌷🌸🌹🌺🌻🌼🌽🌾🌿🍀🍁🍂🍃🍄🍅🍆🍇🍈🍉🍊🍋🍌🍍🍎🍏🍐🍑🍒🍓🥝🥥🥑🥔🥕🥒🌶🥬🥦')),
     # Note: Vicinity is handled as a special option, not in this list
 ]
 
@@ -107,6 +121,7 @@ def generate_category_hotkeys():
     return hotkeys
 
 CATEGORY_HOTKEYS = generate_category_hotkeys()
+CATEGORY_HOTKEY_INDEX = {hotkey: i for i, hotkey in enumerate(CATEGORY_HOTKEYS)}
 
 # QWERTY keyboard layout for character picker
 KEYBOARD_ROWS = [
@@ -173,10 +188,10 @@ class EditorMode(Enum):
     SPRITE_PICKER = auto()       # Sprite picker for placement (scene mode)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Cell:
     char: str = ' '
-    fg: Tuple[int, int, int] = field(default_factory=lambda: DEFAULT_FG)
+    fg: Tuple[int, int, int] = DEFAULT_FG  # Immutable, so shared without a factory call
     bg: Optional[Tuple[int, int, int]] = None
 
     def is_empty(self) -> bool:
@@ -187,24 +202,57 @@ class Cell:
 
     @staticmethod
     def from_dict(d: dict) -> 'Cell':
-        return Cell(char=d['char'], fg=tuple(d['fg']), bg=tuple(d['bg']) if d.get('bg') else None)
+        bg = d.get('bg')
+        return Cell.intern(d['char'], normalize_color(d['fg']), normalize_color(bg) if bg else None)
+
+    @staticmethod
+    def intern(char: str, fg: Tuple[int, int, int] = DEFAULT_FG,
+               bg: Optional[Tuple[int, int, int]] = None) -> 'Cell':
+        """Return a shared Cell for these values (safe to share since Cell is frozen)."""
+        return _pooled_cell(char, fg, bg)
+
+
+# Bounded so long sessions don't keep every cell or color ever seen; an
+# evicted value just gets a fresh (equal) object next time
+@lru_cache(maxsize=8192)
+def _pooled_cell(char: str, fg: Tuple[int, int, int], bg: Optional[Tuple[int, int, int]]) -> Cell:
+    return Cell(char, fg, bg)
 
 
-@dataclass
+@lru_cache(maxsize=1024)
+def _pooled_color(color: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    return color
+
+
+def normalize_color(color) -> Tuple[int, int, int]:
+    """Return color as a pooled tuple, so equal colors share one object."""
+    if type(color) is not tuple:
+        color = tuple(color)
+    return _pooled_color(color)
+
+
+# Seed the pool with the defaults so they are the shared instances
+for _color in [DEFAULT_FG] + COLOR_PALETTE_FG:
+    normalize_color(_color)
+
+
+@dataclass(slots=True)
 class SpriteFrame:
     """A single frame of a sprite (for animation)"""
     cells: Dict[Tuple[int, int], Cell] = field(default_factory=dict)
 
     def to_dict(self, width: int, height: int) -> dict:
         """Convert to serializable format with 2D arrays"""
-        chars = [[' ' for _ in range(width)] for _ in range(height)]
-        fg_colors = [[None for _ in range(width)] for _ in range(height)]
+        # Preallocate dense rows, then scatter the sparse cells into them
+        chars = [[' '] * width for _ in range(height)]
+        fg_colors = [[None] * width for _ in range(height)]
 
         for (x, y), cell in self.cells.items():
             if 0 <= x < width and 0 <= y < height:
                 chars[y][x] = cell.char
-                if cell.fg != DEFAULT_FG:
-                    fg_colors[y][x] = cell.fg
+                fg = cell.fg
+                if fg != DEFAULT_FG:
+                    fg_colors[y][x] = fg
 
         return {'chars': chars, 'fg_colors': fg_colors}
 
@@ -215,18 +263,22 @@ class SpriteFrame:
         chars = d.get('chars', [])
         fg_colors = d.get('fg_colors', [])
 
+        cells = frame.cells
         for y, row in enumerate(chars):
+            # Blank rows are common in padded sprites; skip them in C
+            if row.count(' ') == len(row):
+                continue
+            fg_row = fg_colors[y] if y < len(fg_colors) else ()
+            fg_len = len(fg_row)
             for x, char in enumerate(row):
                 if char != ' ':
-                    fg = DEFAULT_FG
-                    if y < len(fg_colors) and x < len(fg_colors[y]) and fg_colors[y][x]:
-                        fg = tuple(fg_colors[y][x])
-                    frame.cells[(x, y)] = Cell(char=char, fg=fg)
+                    fg = fg_row[x] if x < fg_len else None
+                    cells[(x, y)] = Cell.intern(char, normalize_color(fg) if fg else DEFAULT_FG)
 
         return frame
 
 
-@dataclass
+@dataclass(slots=True)
 class AnimationFrame:
     """Single frame in an animation with optional pixel offset"""
     frame_index: int  # Index into sprite's frames list
@@ -234,7 +286,7 @@ class AnimationFrame:
     offset_y: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class AnimationDef:
     """Named animation sequence"""
     name: str
@@ -242,16 +294,69 @@ class AnimationDef:
     frame_duration: float = 0.2  # Seconds per frame
     loop: bool = True
 
+    def to_dict(self) -> dict:
+        """Convert to SPRITE_DEFS format (frames as 3-tuples)"""
+        return {
+            'frames': [(af.frame_index, af.offset_x, af.offset_y) for af in self.frames],
+            'frame_duration': self.frame_duration,
+            'loop': self.loop,
+        }
 
-@dataclass
+    @staticmethod
+    def from_dict(name: str, d: dict) -> 'AnimationDef':
+        """Load from SPRITE_DEFS format"""
+        return AnimationDef(
+            name=name,
+            frames=[AnimationFrame(*f[:3]) for f in d.get('frames', [])],
+            frame_duration=d.get('frame_duration', 0.2),
+            loop=d.get('loop', True),
+        )
+
+
+@dataclass(slots=True)
 class SpriteLibraryEntry:
     """Reference to an external sprite definition file"""
     file_path: str              # Path to .py sprite file (relative to scene)
     sprite_names: List[str] = field(default_factory=list)  # Names within SPRITE_DEFS
     sprite_defs: dict = field(default_factory=dict)  # Cached SPRITE_DEFS from file
+    loaded_mtime: Optional[float] = None  # File mtime when sprite_defs was read
+    anim_names: Dict[str, List[str]] = field(default_factory=dict)  # Per-sprite animation names
+    anim_next: Dict[str, Dict[str, str]] = field(default_factory=dict)  # Per-sprite name -> next name
+    preview_cache: Dict[str, Tuple[str, str]] = field(default_factory=dict)  # Picker (char, name) per sprite
+    default_fgs: Dict[str, Tuple[int, int, int]] = field(default_factory=dict)  # Normalized default_fg per sprite
+
+    def index_animations(self):
+        """Precompute animation name lists and cycle order for each sprite."""
+        self.anim_names = {}
+        self.anim_next = {}
+        for sprite_name, sprite_def in self.sprite_defs.items():
+            names = [sys.intern(n) for n in (sprite_def.get('animations') or {})]
+            self.anim_names[sprite_name] = names
+            self.anim_next[sprite_name] = {
+                name: names[(i + 1) % len(names)] for i, name in enumerate(names)
+            }
 
+    def index_previews(self):
+        """Precompute the sprite picker's preview char and display name."""
+        self.preview_cache = {}
+        for sprite_name, sprite_def in self.sprite_defs.items():
+            frames = sprite_def.get('frames') or [{}]
+            chars = frames[0].get('chars', [[]])
+            if chars and chars[0] and chars[0][0] != ' ':
+                preview_char = chars[0][0]
+            else:
+                preview_char = '?'
+            self.preview_cache[sprite_name] = (preview_char, sprite_name[:10])
+
+    def index_colors(self):
+        """Normalize each sprite's default_fg once, leaving sprite_defs untouched."""
+        self.default_fgs = {
+            sprite_name: normalize_color(sprite_def.get('default_fg', DEFAULT_FG))
+            for sprite_name, sprite_def in self.sprite_defs.items()
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class SpriteInstance:
     """A placed sprite in the scene"""
     library_key: str            # "path/to/file.py:sprite_name"
@@ -259,9 +364,15 @@ class SpriteInstance:
     x: int
     y: int
     initial_animation: Optional[str] = None
+    # Parsed from library_key once, so scans compare interned strings
+    lib_path: str = field(init=False, repr=False, compare=False)
+    sprite_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.lib_path, self.sprite_name = split_library_key(self.library_key)
 
 
-@dataclass
+@dataclass(slots=True)
 class SpriteData:
     """Complete sprite definition (may contain multiple frames)"""
     name: str
@@ -280,14 +391,7 @@ class SpriteData:
             'frames': [f.to_dict(self.width, self.height) for f in self.frames],
         }
         if self.animations:
-            result['animations'] = {
-                name: {
-                    'frames': [(af.frame_index, af.offset_x, af.offset_y) for af in anim.frames],
-                    'frame_duration': anim.frame_duration,
-                    'loop': anim.loop,
-                }
-                for name, anim in self.animations.items()
-            }
+            result['animations'] = {name: anim.to_dict() for name, anim in self.animations.items()}
         return result
 
     @staticmethod
@@ -303,20 +407,11 @@ class SpriteData:
         # Load animations
         if 'animations' in d:
             for anim_name, anim_data in d['animations'].items():
-                anim_frames = [
-                    AnimationFrame(frame_index=f[0], offset_x=f[1], offset_y=f[2])
-                    for f in anim_data.get('frames', [])
-                ]
-                sprite.animations[anim_name] = AnimationDef(
-                    name=anim_name,
-                    frames=anim_frames,
-                    frame_duration=anim_data.get('frame_duration', 0.2),
-                    loop=anim_data.get('loop', True),
-                )
+                sprite.animations[anim_name] = AnimationDef.from_dict(anim_name, anim_data)
         return sprite
 
 
-@dataclass
+@dataclass(slots=True)
 class EditorState:
     # Editor mode: "sprite" or "scene"
     editor_mode: str = "sprite"
@@ -325,7 +420,8 @@ class EditorState:
     mode: EditorMode = EditorMode.NORMAL
 
     # Canvas/sprite dimensions
-    cells: Dict[Tuple[int, int], Cell] = field(default_factory=dict)
+    cells: Dict[Tuple[int, int], Cell] = field(default_factory=dict)  # Shared with the current frame
+    cells_version: int = 0  # Bumped on in-place edits to cells
     canvas_width: int = DEFAULT_CANVAS_WIDTH
     canvas_height: int = DEFAULT_CANVAS_HEIGHT
 
@@ -371,12 +467,14 @@ class EditorState:
 
     # For multi-key sequences (like gg, dd)
     pending_key: Optional[str] = None
+    key_mods: int = 0  # pygame.key.get_mods() captured once per keypress
 
     # Palette state
     palette_category: int = 0
     palette_cursor: int = 0
     palette_scroll: int = 0
     recent_chars: List[str] = field(default_factory=list)
+    recent_version: int = 0  # Bumped whenever recent_chars changes
     last_selected_codepoint: int = 0x2500  # For vicinity mode
     codepoint_buffer: str = ""             # For typing codepoints
 
@@ -395,6 +493,8 @@ class EditorState:
     # Scene mode state
     sprite_library: Dict[str, SpriteLibraryEntry] = field(default_factory=dict)  # Loaded sprite files
     sprite_instances: Dict[str, SpriteInstance] = field(default_factory=dict)    # Placed sprites in scene
+    instances_by_lib: Dict[str, Set[str]] = field(default_factory=dict)         # lib_path -> instance IDs
+    library_version: int = 0  # Bumped whenever sprite_library changes
     scene_tool: str = "char"                        # "char" or "sprite"
     selected_library_sprite: Optional[str] = None   # Current sprite to place (library_key)
     sprite_library_cursor: int = 0                  # Cursor in library list
@@ -403,6 +503,9 @@ class EditorState:
     scene_preview_sprites: Dict[str, Any] = field(default_factory=dict)  # pyunicodegame sprites for scene preview
     help_page: int = 0                              # Current help page (0=general, 1=scene)
 
+    def __post_init__(self):
+        self.cells = self.frames[self.current_frame].cells
+
     def get_cell(self, x: int, y: int) -> Optional[Cell]:
         return self.cells.get((x, y))
 
@@ -411,13 +514,109 @@ class EditorState:
             self.cells.pop((x, y), None)
         else:
             self.cells[(x, y)] = cell
+        self.cells_version += 1
         self.modified = True
 
     def clear_cell(self, x: int, y: int):
         if (x, y) in self.cells:
             del self.cells[(x, y)]
+            self.cells_version += 1
             self.modified = True
 
+    def clear_cells(self):
+        self.cells.clear()
+        self.cells_version += 1
+
+    def fill_rect(self, x0: int, y0: int, x1: int, y1: int, cell: Cell):
+        """Set every cell in the inclusive rectangle to one shared cell."""
+        if cell.is_empty():
+            self.clear_rect(x0, y0, x1, y1)
+            return
+        xs = range(x0, x1 + 1)
+        self.cells.update(dict.fromkeys([(x, y) for y in range(y0, y1 + 1) for x in xs], cell))
+        self.cells_version += 1
+        self.modified = True
+
+    def rect_keys(self, x0: int, y0: int, x1: int, y1: int) -> List[Tuple[int, int]]:
+        """Positions of existing cells in the inclusive rectangle.
+
+        Walks whichever is smaller: the rectangle or the cell dict.
+        """
+        cells = self.cells
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(cells):
+            xs = range(x0, x1 + 1)
+            return [(x, y) for y in range(y0, y1 + 1) for x in xs if (x, y) in cells]
+        return [(x, y) for x, y in cells if x0 <= x <= x1 and y0 <= y <= y1]
+
+    def clear_rect(self, x0: int, y0: int, x1: int, y1: int) -> int:
+        """Clear the inclusive rectangle, returning how many cells were removed."""
+        cells = self.cells
+        keys = self.rect_keys(x0, y0, x1, y1)
+        for key in keys:
+            del cells[key]
+        if keys:
+            self.cells_version += 1
+            self.modified = True
+        return len(keys)
+
+    def copy_rect(self, x0: int, y0: int, x1: int, y1: int,
+                  origin_x: int, origin_y: int) -> Dict[Tuple[int, int], Cell]:
+        """Copy the inclusive rectangle's cells, keyed relative to origin."""
+        # Cells are frozen, so the copy can share them
+        cells = self.cells
+        return {(x - origin_x, y - origin_y): cells[(x, y)]
+                for x, y in self.rect_keys(x0, y0, x1, y1)}
+
+    def paste_cells(self, cells: Dict[Tuple[int, int], Cell], x: int, y: int):
+        """Paste relative-keyed cells at (x, y), clipped to the canvas."""
+        w, h = self.canvas_width, self.canvas_height
+        target = self.cells
+        changed = False
+        for (dx, dy), cell in cells.items():
+            px = x + dx
+            py = y + dy
+            if 0 <= px < w and 0 <= py < h:
+                if cell.is_empty():
+                    target.pop((px, py), None)
+                else:
+                    target[(px, py)] = cell
+                changed = True
+        if changed:
+            self.cells_version += 1
+            self.modified = True
+
+    def add_library(self, lib_path: str, entry: SpriteLibraryEntry):
+        """Add or replace a loaded sprite library."""
+        self.sprite_library[lib_path] = entry
+        self.library_version += 1
+
+    def remove_library(self, lib_path: str):
+        self.sprite_library.pop(lib_path, None)
+        self.library_version += 1
+
+    def clear_library(self):
+        self.sprite_library.clear()
+        self.library_version += 1
+
+    def add_instance(self, instance: SpriteInstance):
+        """Add a placed sprite, keeping the per-library index in sync."""
+        self.sprite_instances[instance.instance_id] = instance
+        self.instances_by_lib.setdefault(instance.lib_path, set()).add(instance.instance_id)
+
+    def remove_instance(self, instance_id: str):
+        """Remove a placed sprite, keeping the per-library index in sync."""
+        instance = self.sprite_instances.pop(instance_id, None)
+        if instance:
+            ids = self.instances_by_lib.get(instance.lib_path)
+            if ids:
+                ids.discard(instance_id)
+                if not ids:
+                    del self.instances_by_lib[instance.lib_path]
+
+    def clear_instances(self):
+        self.sprite_instances.clear()
+        self.instances_by_lib.clear()
+
     def clamp_cursor(self):
         self.cursor_x = max(0, min(self.canvas_width - 1, self.cursor_x))
         self.cursor_y = max(0, min(self.canvas_height - 1, self.cursor_y))
@@ -478,16 +677,84 @@ def get_current_category_chars():
         return "Unknown", []
 
 
+def split_library_key(library_key: str) -> Tuple[str, str]:
+    """Split "path/to/file.py:sprite_name" into interned (lib_path, sprite_name)."""
+    lib_path, _, sprite_name = library_key.partition(':')
+    return sys.intern(lib_path), sys.intern(sprite_name)
+
+
+_library_paths_cache: Tuple[int, List[str]] = (-1, [])
+_animation_names_cache: Tuple[frozenset, List[str]] = (frozenset(), [])
+
+
+def get_sorted_library_paths() -> List[str]:
+    """Sorted paths of loaded libraries, cached until the library changes (read-only)."""
+    global _library_paths_cache
+    version, paths = _library_paths_cache
+    if version != state.library_version:
+        paths = sorted(state.sprite_library)
+        _library_paths_cache = (state.library_version, paths)
+    return paths
+
+
+def get_sorted_animation_names() -> List[str]:
+    """Sorted animation names, re-sorted only when the set of names changes (read-only)."""
+    global _animation_names_cache
+    keys, names = _animation_names_cache
+    if keys != state.animations.keys():
+        names = sorted(state.animations)
+        _animation_names_cache = (frozenset(state.animations), names)
+    return names
+
+
+_library_sprites_cache: Tuple[int, List[Tuple[str, str, dict]]] = (-1, [])
+
+
 def get_all_library_sprites() -> List[Tuple[str, str, dict]]:
     """Get all sprites from all loaded libraries.
 
+    The list is cached until the library changes, so callers must not mutate it.
+
     Returns:
         List of (library_key, sprite_name, sprite_def) tuples
     """
+    global _library_sprites_cache
+    version, result = _library_sprites_cache
+    if version == state.library_version:
+        return result
+
     result = []
     for lib_path, entry in state.sprite_library.items():
         for sprite_name in entry.sprite_names:
-            library_key = f"{lib_path}:{sprite_name}"
+            library_key = sys.intern(f"{lib_path}:{sprite_name}")
             sprite_def = entry.sprite_defs[sprite_name]
             result.append((library_key, sprite_name, sprite_def))
+    _library_sprites_cache = (state.library_version, result)
+    return result
+
+
+_library_previews_cache: Tuple[int, List[Tuple[str, str]]] = (-1, [])
+
+
+def get_library_sprite_previews() -> List[Tuple[str, str]]:
+    """Get (preview_char, name_display) for each entry of get_all_library_sprites().
+
+    Cached until the library changes, like get_all_library_sprites().
+    """
+    global _library_previews_cache
+    version, result = _library_previews_cache
+    if version == state.library_version:
+        return result
+
+    result = []
+    for entry in state.sprite_library.values():
+        cache = entry.preview_cache
+        for sprite_name in entry.sprite_names:
+            preview = cache.get(sprite_name)
+            if preview is None:
+                entry.index_previews()
+                cache = entry.preview_cache
+                preview = cache[sprite_name]
+            result.append(preview)
+    _library_previews_cache = (state.library_version, result)
     return result
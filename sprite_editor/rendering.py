@@ -5,6 +5,7 @@ Sprite & Scene Editor - Rendering functions
 import pygame
 import pyunicodegame
 import random
+from functools import lru_cache
 
 try:
     from . import models
@@ -16,7 +17,8 @@ try:
         PALETTE_CATEGORIES, CATEGORY_HOTKEYS, KEYBOARD_ROWS, KEY_TO_INDEX,
         RANDOM_UNICODE_RANGES,
         EditorMode, MODE_DISPLAY,
-        get_all_library_sprites,
+        get_all_library_sprites, get_library_sprite_previews,
+        get_sorted_library_paths, get_sorted_animation_names,
     )
 except ImportError:
     import models
@@ -28,7 +30,8 @@ except ImportError:
         PALETTE_CATEGORIES, CATEGORY_HOTKEYS, KEYBOARD_ROWS, KEY_TO_INDEX,
         RANDOM_UNICODE_RANGES,
         EditorMode, MODE_DISPLAY,
-        get_all_library_sprites,
+        get_all_library_sprites, get_library_sprite_previews,
+        get_sorted_library_paths, get_sorted_animation_names,
     )
 
 
@@ -36,30 +39,75 @@ except ImportError:
 # HELPER FUNCTIONS
 # ============================================================================
 
-def generate_vicinity_chars(center_codepoint: int, count: int = 40) -> list:
-    """Get chars near a codepoint."""
-    chars = []
-    for offset in range(-count // 2, count // 2 + 1):
-        cp = center_codepoint + offset
-        if 0x20 <= cp <= 0x10FFFF and cp != center_codepoint:
-            try:
-                char = chr(cp)
-                chars.append(char)
-            except (ValueError, OverflowError):
-                pass
+@lru_cache(maxsize=64)
+def generate_vicinity_chars(center_codepoint: int, count: int = 40) -> tuple:
+    """Get chars near a codepoint (cached, so the tuple is shared and read-only)."""
+    # Clamp the scan window to valid codepoints up front instead of testing each one
+    start = max(center_codepoint + (-count // 2), 0x20)
+    stop = min(center_codepoint + count // 2 + 1, 0x110000)
+    chars = tuple(chr(cp) for cp in range(start, stop) if cp != center_codepoint)
     return chars[:count]
 
 
+def put_strings(window, batch):
+    """Draw a precomputed list of (x, y, text, color) strings on a window."""
+    put_string = window.put_string
+    for x, y, text, color in batch:
+        put_string(x, y, text, color)
+
+
+# Fixed-width strings reused every frame by the full-screen overlays
+_BLANK_ROW = ' ' * ROOT_WIDTH
+_HR_DOUBLE = '═' * ROOT_WIDTH
+_HR_20 = '─' * 20
+_HR_25 = '─' * 25
+_HR_40 = '─' * 40
+_HR_54 = '─' * 54
+_HR_56 = '─' * 56
+_PICKER_BOX_TOP = '┌' + '─' * 10 + '┐'
+_PICKER_BOX_BOTTOM = '└' + '─' * 10 + '┘'
+
+# QWERTY picker key label positions (x, y, key), one per palette slot.
+# Each key cell is 4 chars wide, rows are 3 apart and indented by one more each.
+_KEY_POSITIONS = tuple(
+    (row_indent + 1 + col * 4, 4 + row_idx * 3, key)
+    for row_idx, (row_indent, row) in enumerate(zip((4, 5, 6, 7), KEYBOARD_ROWS))
+    for col, key in enumerate(row)
+)
+
+# The key labels are ASCII, so each keyboard row's labels fit one string
+_KEY_LABEL_ROWS = tuple(
+    (row_indent + 1, 4 + row_idx * 3, '   '.join(row))
+    for row_idx, (row_indent, row) in enumerate(zip((4, 5, 6, 7), KEYBOARD_ROWS))
+)
+
+
+def fill_background(color: tuple):
+    """Blank the whole root window with one batch of full-width rows."""
+    put_strings(models.root, _background_batch(color))
+
+
+@lru_cache(maxsize=8)
+def _background_batch(color: tuple) -> tuple:
+    return tuple((0, y, _BLANK_ROW, color) for y in range(ROOT_HEIGHT))
+
+
 def get_random_char() -> str:
     """Get random character from interesting Unicode ranges."""
-    for _ in range(100):  # Max attempts
-        range_start, range_end = random.choice(RANDOM_UNICODE_RANGES)
-        cp = random.randint(range_start, range_end)
-        try:
-            return chr(cp)
-        except (ValueError, OverflowError):
-            continue
-    return '?'  # Fallback
+    return get_random_chars(1)[0]
+
+
+# Half-open (start, stop) bounds for randrange, which skips randint's extra call
+_RANDOM_RANGE_BOUNDS = tuple((start, end + 1) for start, end in RANDOM_UNICODE_RANGES)
+
+
+def get_random_chars(n: int) -> list:
+    """Get n random characters, each from a randomly chosen interesting range."""
+    # Every codepoint in RANDOM_UNICODE_RANGES is valid for chr(), so no retries.
+    # Ranges are picked uniformly (not by size) so small blocks still show up.
+    ranges = random.choices(_RANDOM_RANGE_BOUNDS, k=n)
+    randrange = random.randrange
+    return [chr(randrange(start, stop)) for start, stop in ranges]
 
 
 # ============================================================================
@@ -69,29 +117,9 @@ def get_random_char() -> str:
 def render():
     """Main render function called each frame"""
     # Full-screen overlays take over everything
-    if state.mode == EditorMode.HELP:
-        render_help_overlay()
-        return
-    if state.mode == EditorMode.PALETTE_CATEGORIES:
-        render_palette_categories()
-        return
-    if state.mode == EditorMode.PALETTE_QWERTY:
-        render_palette_qwerty()
-        return
-    if state.mode == EditorMode.PALETTE_CODEPOINT:
-        render_palette_codepoint()
-        return
-    if state.mode == EditorMode.ANIMATION_EDITOR:
-        render_animation_editor()
-        return
-    if state.mode == EditorMode.ANIMATION_PREVIEW:
-        render_animation_preview()
-        return
-    if state.mode == EditorMode.SPRITE_LIBRARY:
-        render_sprite_library()
-        return
-    if state.mode == EditorMode.SPRITE_PICKER:
-        render_sprite_picker()
+    overlay = OVERLAY_RENDERERS.get(state.mode)
+    if overlay is not None:
+        overlay()
         return
 
     # Draw border/frame on root window around sprite area
@@ -109,105 +137,281 @@ def render():
 
 def render_sprite_frame():
     """Draw a frame around the sprite editing area on root window"""
+    put_strings(models.root, _sprite_frame_batch(state.canvas_width, state.canvas_height))
+
+
+@lru_cache(maxsize=8)
+def _sprite_frame_batch(canvas_width: int, canvas_height: int) -> tuple:
+    """Frame strings as (x, y, text, color), built once per canvas size."""
     # Calculate sprite window position (centered in available space)
     avail_h = ROOT_HEIGHT - STATUS_HEIGHT
-    sx = (ROOT_WIDTH - state.canvas_width) // 2 - 1
-    sy = (avail_h - state.canvas_height) // 2 - 1
-
-    # Draw box around sprite area
-    box_w = state.canvas_width + 2
-    box_h = state.canvas_height + 2
+    sx = (ROOT_WIDTH - canvas_width) // 2 - 1
+    sy = (avail_h - canvas_height) // 2 - 1
     frame_color = (60, 60, 80)
 
+    # Box around sprite area
+    box_w = canvas_width + 2
+    box_h = canvas_height + 2
+    right_x = sx + box_w - 1
+
     # Top and bottom
-    models.root.put_string(sx, sy, '┌' + '─' * state.canvas_width + '┐', frame_color)
-    models.root.put_string(sx, sy + box_h - 1, '└' + '─' * state.canvas_width + '┘', frame_color)
+    batch = [
+        (sx, sy, '┌' + '─' * canvas_width + '┐', frame_color),
+        (sx, sy + box_h - 1, '└' + '─' * canvas_width + '┘', frame_color),
+    ]
 
     # Sides
-    for y in range(1, box_h - 1):
-        models.root.put(sx, sy + y, '│', frame_color)
-        models.root.put(sx + box_w - 1, sy + y, '│', frame_color)
+    for y in range(sy + 1, sy + box_h - 1):
+        batch.append((sx, y, '│', frame_color))
+        batch.append((right_x, y, '│', frame_color))
+    return tuple(batch)
+
+
+_canvas_ops_cells = None
+_canvas_ops_key = None
+_canvas_ops = ()
 
 
 def render_canvas():
     """Render the canvas area with all cells and cursor on sprite window"""
-    # Draw all cells
-    for (x, y), cell in state.cells.items():
-        # Check if in viewport
-        vx = x - state.viewport_x
-        vy = y - state.viewport_y
-        if 0 <= vx < state.canvas_width and 0 <= vy < state.canvas_height:
-            if cell.bg:
-                # Draw background first
-                models.sprite_win.put(vx, vy, '█', cell.bg)
-            models.sprite_win.put(vx, vy, cell.char, cell.fg)
+    global _canvas_ops_cells, _canvas_ops_key, _canvas_ops
+    cells = state.cells
+    get = cells.get
+    put = models.sprite_win.put
+    ox, oy = state.viewport_x, state.viewport_y
+    w, h = state.canvas_width, state.canvas_height
+    cur_x, cur_y = state.cursor_x, state.cursor_y
+    mode = state.mode
+    insert = mode == EditorMode.INSERT
+
+    # Selection rectangle in VISUAL mode, clipped to the viewport. Everything
+    # under it is overdrawn by the highlight, so the other passes skip it.
+    sel_x0, sel_x1, sel_y0, sel_y1 = 0, -1, 0, -1
+    if mode == EditorMode.VISUAL and state.selection_start:
+        sx, sy = state.selection_start
+        sel_x0 = max(min(sx, cur_x) - ox, 0)
+        sel_x1 = min(max(sx, cur_x) - ox, w - 1)
+        sel_y0 = max(min(sy, cur_y) - oy, 0)
+        sel_y1 = min(max(sy, cur_y) - oy, h - 1)
+
+    # Cell draw calls only change with the cells, viewport or selection, so
+    # they are rebuilt on change and replayed every frame otherwise
+    key = (state.cells_version, ox, oy, w, h, sel_x0, sel_x1, sel_y0, sel_y1)
+    if cells is not _canvas_ops_cells or key != _canvas_ops_key:
+        _canvas_ops = build_canvas_ops(cells, ox, oy, w, h, (sel_x0, sel_x1, sel_y0, sel_y1))
+        _canvas_ops_cells = cells
+        _canvas_ops_key = key
+    put_strings(models.sprite_win, _canvas_ops)
 
     # Draw cursor
-    cx = state.cursor_x - state.viewport_x
-    cy = state.cursor_y - state.viewport_y
+    cx = cur_x - ox
+    cy = cur_y - oy
 
-    if 0 <= cx < state.canvas_width and 0 <= cy < state.canvas_height:
-        if state.cursor_visible or state.mode == EditorMode.INSERT:
+    if 0 <= cx < w and 0 <= cy < h and not (sel_x0 <= cx <= sel_x1 and sel_y0 <= cy <= sel_y1):
+        if insert or state.cursor_visible:
             # Get character under cursor
-            cell = state.get_cell(state.cursor_x, state.cursor_y)
+            cell = get((cur_x, cur_y))
             char_under = cell.char if cell else ' '
 
-            if state.mode == EditorMode.INSERT:
+            if insert:
                 # Block cursor in insert mode
-                models.sprite_win.put(cx, cy, '█', COLOR_CURSOR_INSERT)
+                put(cx, cy, '█', COLOR_CURSOR_INSERT)
                 if char_under != ' ':
-                    models.sprite_win.put(cx, cy, char_under, (0, 0, 0))
+                    put(cx, cy, char_under, (0, 0, 0))
             else:
                 # Underline-style cursor in normal mode
-                models.sprite_win.put(cx, cy, '▁', COLOR_CURSOR)
+                put(cx, cy, '▁', COLOR_CURSOR)
 
     # Sprites are rendered by pyunicodegame via models.root.update_sprites()
     # We don't need to manually render them here anymore
 
-    # Draw selection highlight in VISUAL mode
-    if state.mode == EditorMode.VISUAL and state.selection_start:
-        sx, sy = state.selection_start
-        min_x = min(sx, state.cursor_x)
-        max_x = max(sx, state.cursor_x)
-        min_y = min(sy, state.cursor_y)
-        max_y = max(sy, state.cursor_y)
-
-        for y in range(min_y, max_y + 1):
-            for x in range(min_x, max_x + 1):
-                vx = x - state.viewport_x
-                vy = y - state.viewport_y
-                if 0 <= vx < state.canvas_width and 0 <= vy < state.canvas_height:
-                    cell = state.get_cell(x, y)
-                    char = cell.char if cell else ' '
-                    # Highlight with inverted colors
-                    models.sprite_win.put(vx, vy, char if char != ' ' else '░', COLOR_VISUAL)
+
+def build_canvas_ops(cells: dict, ox: int, oy: int, w: int, h: int, selection: tuple) -> tuple:
+    """Compute draw calls for visible cells and the selection highlight.
+
+    Returns one (x, y, text, color) batch for put_strings: cells with a
+    background (block then char), runs of same-colored neighbours outside
+    the selection, and one highlight string per selected row.
+    """
+    sel_x0, sel_x1, sel_y0, sel_y1 = selection
+    ops = []
+    add = ops.append
+    rows = {}
+    visible = []
+    keep = visible.append
+
+    # Walk whichever is smaller: the cell dict or the viewport
+    if len(cells) <= w * h:
+        for (x, y), cell in cells.items():
+            # Check if in viewport
+            vx = x - ox
+            vy = y - oy
+            if 0 <= vx < w and 0 <= vy < h:
+                if sel_x0 <= vx <= sel_x1 and sel_y0 <= vy <= sel_y1:
+                    continue
+                keep((vx, vy, cell))
+    else:
+        get = cells.get
+        for vy in range(h):
+            for vx in range(w):
+                cell = get((vx + ox, vy + oy))
+                if cell is not None:
+                    if sel_x0 <= vx <= sel_x1 and sel_y0 <= vy <= sel_y1:
+                        continue
+                    keep((vx, vy, cell))
+
+    for vx, vy, cell in visible:
+        if cell.bg:
+            # Draw background first
+            add((vx, vy, '█', cell.bg))
+            add((vx, vy, cell.char, cell.fg))
+        else:
+            rows.setdefault(vy, []).append((vx, cell.char, cell.fg))
+
+    # Merge horizontally adjacent cells of the same color into runs
+    for vy, row in rows.items():
+        row.sort(key=lambda item: item[0])
+        start_x, chars, fg = row[0][0], [row[0][1]], row[0][2]
+        for vx, char, cell_fg in row[1:]:
+            if vx == start_x + len(chars) and cell_fg == fg:
+                chars.append(char)
+            else:
+                add((start_x, vy, ''.join(chars), fg))
+                start_x, chars, fg = vx, [char], cell_fg
+        add((start_x, vy, ''.join(chars), fg))
+
+    # Selection highlight in VISUAL mode, one clipped string per row
+    get = cells.get
+    sel_xs = range(sel_x0 + ox, sel_x1 + 1 + ox)
+    for vy in range(sel_y0, sel_y1 + 1):
+        y = vy + oy
+        row = []
+        for x in sel_xs:
+            cell = get((x, y))
+            char = cell.char if cell else ' '
+            # Highlight with inverted colors
+            row.append(char if char != ' ' else '░')
+        add((sel_x0, vy, ''.join(row), COLOR_VISUAL))
+
+    return tuple(ops)
+
+
+_recent_preview = ([], '')
 
 
 def render_mini_palette():
     """Render the mini palette bar above status on status window"""
+    global _recent_preview
     palette_row = 0  # First row of status window
     w = ROOT_WIDTH
 
     # Show recent chars (1-9 to select)
     recent = state.recent_chars[:9]
     if recent:
-        preview = ''.join(recent)
-        models.status_win.put_string(1, palette_row, "Recent:", COLOR_STATUS_DIM)
-        models.status_win.put_string(9, palette_row, preview, state.current_fg)
+        if recent != _recent_preview[0]:
+            _recent_preview = (recent, ''.join(recent))
+        batch = [(1, palette_row, "Recent:", COLOR_STATUS_DIM),
+                 (9, palette_row, _recent_preview[1], state.current_fg)]
     else:
-        models.status_win.put_string(1, palette_row, "(no recent chars)", COLOR_STATUS_DIM)
+        batch = [(1, palette_row, "(no recent chars)", COLOR_STATUS_DIM)]
 
     # Show hint with codepoint on right side
-    code = ord(state.current_char)
-    hint = f"U+{code:04X} [p]alette"
-    models.status_win.put_string(w - len(hint) - 1, palette_row, hint, (80, 80, 100))
+    hint = codepoint_hint(state.current_char)
+    batch.append((w - len(hint) - 1, palette_row, hint, (80, 80, 100)))
+    put_strings(models.status_win, batch)
+
+
+@lru_cache(maxsize=128)
+def codepoint_hint(char: str) -> str:
+    """Format the mini palette's codepoint hint for a character."""
+    return format_codepoint(char) + " [p]alette"
+
+
+@lru_cache(maxsize=2048)
+def format_codepoint(char: str) -> str:
+    """Format a character's codepoint as U+XXXX."""
+    return f"U+{ord(char):04X}"
+
+
+@lru_cache(maxsize=256)
+def format_duration(duration: float) -> str:
+    """Format an animation frame duration for display."""
+    return f"{duration:.2f}s/frame"
+
+
+@lru_cache(maxsize=256)
+def format_frame_sequence(frames: tuple, more: bool) -> str:
+    """Format up to 8 (frame_index, offset_x, offset_y) entries as a 26-column sequence line."""
+    # Stop building once the 26-column line is full
+    parts = []
+    total = -1
+    for frame_index, offset_x, offset_y in frames:
+        part = f"F{frame_index+1}" + (f"({offset_x},{offset_y})" if offset_x or offset_y else "")
+        parts.append(part)
+        total += len(part) + 1
+        if total >= 26:
+            break
+    seq = " ".join(parts)
+    if more:
+        seq += "..."
+    return seq[:26]
+
+
+_status_layout_key = None
+_status_layout = None
+_status_batch_key = None
+_status_batch = ()
 
 
 def render_status_bar():
     """Render the status bar on status window"""
+    global _status_layout_key, _status_layout, _status_batch_key, _status_batch
     status_row = 1  # Second row of status window (after mini palette)
     w = ROOT_WIDTH
 
+    # Everything except the cursor position and current char changes at human speed
+    key = (state.editor_mode, state.scene_tool, state.selected_library_sprite, state.mode,
+           state.modified, state.sprite_name, state.file_path, state.canvas_width,
+           state.canvas_height, len(state.frames), state.current_frame,
+           state.animation_playing, state.current_animation)
+    message = state.status_message if state.status_message_time > 0 else ""
+    batch_key = (key, state.cursor_x, state.cursor_y, state.current_char, state.current_fg, message)
+
+    # Idle frames replay the last batch untouched
+    if batch_key != _status_batch_key:
+        if key != _status_layout_key:
+            _status_layout = build_status_layout(w, status_row)
+            _status_layout_key = key
+        head, pos_x, frame_part, char_pos, name_part = _status_layout
+
+        batch = list(head)
+
+        # Position
+        batch.append((pos_x, status_row, f"{state.cursor_x},{state.cursor_y}", COLOR_STATUS_DIM))
+
+        # Frame info (sprite mode only)
+        if frame_part:
+            batch.append(frame_part)
+
+        # Current character with color indicator
+        batch.append((char_pos, status_row, state.current_char, state.current_fg))
+
+        # Sprite name or file path (right-aligned)
+        batch.append(name_part)
+
+        # Status message (temporary) - on next row
+        if message:
+            msg_x = (w - len(message)) // 2
+            batch.append((msg_x, status_row + 1, message, COLOR_STATUS_BRIGHT))
+
+        _status_batch = tuple(batch)
+        _status_batch_key = batch_key
+
+    put_strings(models.status_win, _status_batch)
+
+
+def build_status_layout(w: int, row: int) -> tuple:
+    """Compute the status bar pieces that don't depend on the cursor."""
     # Editor mode indicator (SPRITE or SCENE)
     if state.editor_mode == "sprite":
         editor_mode_text = "SPRITE"
@@ -220,19 +424,15 @@ def render_status_bar():
         else:
             editor_mode_text = "SCENE[char]"
         editor_mode_color = (200, 255, 100)
-    models.status_win.put_string(0, status_row, editor_mode_text, editor_mode_color)
 
     # Vim mode indicator - position after editor mode text
     mode_text, mode_color = MODE_DISPLAY[state.mode]
     mode_pos = len(editor_mode_text) + 1
-    models.status_win.put_string(mode_pos, status_row, mode_text, mode_color)
-
-    # Position
-    pos_text = f"{state.cursor_x},{state.cursor_y}"
+    head = ((0, row, editor_mode_text, editor_mode_color), (mode_pos, row, mode_text, mode_color))
     pos_x = max(22, mode_pos + len(mode_text) + 1)
-    models.status_win.put_string(pos_x, status_row, pos_text, COLOR_STATUS_DIM)
 
     # Frame info (sprite mode only)
+    frame_part = None
     if state.editor_mode == "sprite" and len(state.frames) > 1:
         frame_text = f"F{state.current_frame + 1}/{len(state.frames)}"
         if state.animation_playing:
@@ -240,13 +440,12 @@ def render_status_bar():
                 frame_text = f"[{state.current_animation}] {frame_text} ▶"
             else:
                 frame_text = f"{frame_text} ▶"
-            models.status_win.put_string(30, status_row, frame_text, (100, 255, 100))
+            frame_part = (30, row, frame_text, (100, 255, 100))
         else:
-            models.status_win.put_string(30, status_row, frame_text, (150, 150, 200))
+            frame_part = (30, row, frame_text, (150, 150, 200))
 
-    # Current character with color indicator (adjust position based on frame text)
+    # Current character position (adjust based on frame text)
     char_pos = 50 if state.animation_playing and state.current_animation else 40 if len(state.frames) > 1 else 32
-    models.status_win.put(char_pos, status_row, state.current_char, state.current_fg)
 
     # Sprite name or file path (right-aligned, leave room for char display)
     if state.editor_mode == "sprite":
@@ -257,14 +456,7 @@ def render_status_bar():
     if state.modified:
         name_text += "[+]"
 
-    # Right-align name
-    name_x = w - len(name_text) - 1
-    models.status_win.put_string(name_x, status_row, name_text, COLOR_STATUS_DIM)
-
-    # Status message (temporary) - on next row
-    if state.status_message and state.status_message_time > 0:
-        msg_x = (w - len(state.status_message)) // 2
-        models.status_win.put_string(msg_x, status_row + 1, state.status_message, COLOR_STATUS_BRIGHT)
+    return head, pos_x, frame_part, char_pos, (w - len(name_text) - 1, row, name_text, COLOR_STATUS_DIM)
 
 
 def render_command_line():
@@ -287,10 +479,22 @@ def render_command_line():
 
 def render_palette_categories():
     """Render the category selection screen (Screen 1)"""
-    # Hide other windows during palette
-    models.sprite_win.visible = False
-    models.status_win.visible = False
+    # Background
+    fill_background((20, 20, 30))
 
+    # Clamp category to valid range
+    if state.palette_category < 0:
+        state.palette_category = 0
+    elif state.palette_category >= len(PALETTE_CATEGORIES):
+        state.palette_category = len(PALETTE_CATEGORIES) - 1
+
+    # Everything else only changes with the selection or the recent chars
+    put_strings(models.root, build_palette_categories(state.palette_category, state.recent_version))
+
+
+@lru_cache(maxsize=32)
+def build_palette_categories(selected: int, recent_version: int) -> tuple:
+    """Lay out the category screen as (x, y, text, color) strings (recent_version keys the cache)."""
     w, h = ROOT_WIDTH, ROOT_HEIGHT
     title_color = (100, 200, 255)
     heading_color = (255, 200, 100)
@@ -299,30 +503,19 @@ def render_palette_categories():
     preview_color = (150, 150, 200)
     hotkey_color = (200, 200, 100)
 
-    # Background
-    for y in range(h):
-        for x in range(w):
-            models.root.put(x, y, ' ', (20, 20, 30))
+    batch = []
+    add = batch.append
 
     # Title
     title = "CHARACTER PALETTE"
-    models.root.put_string((w - len(title)) // 2, 1, title, title_color)
-    models.root.put_string(0, 2, "═" * w, (60, 60, 80))
-
-    # Update dynamic categories
-    PALETTE_CATEGORIES[0] = ('Recent', state.recent_chars[:40])
-
-    # Clamp category to valid range
-    if state.palette_category < 0:
-        state.palette_category = 0
-    elif state.palette_category >= len(PALETTE_CATEGORIES):
-        state.palette_category = len(PALETTE_CATEGORIES) - 1
+    add(((w - len(title)) // 2, 1, title, title_color))
+    add((0, 2, _HR_DOUBLE, (60, 60, 80)))
 
     # Calculate visible range for scrolling
     # y starts at 4, breaks at h-6, so actual visible = h - 10
     visible_rows = h - 10
     max_scroll = max(0, len(PALETTE_CATEGORIES) - visible_rows)
-    scroll_offset = max(0, min(state.palette_category - visible_rows // 2, max_scroll))
+    scroll_offset = max(0, min(selected - visible_rows // 2, max_scroll))
 
     # Draw categories with hotkeys
     y = 4
@@ -330,175 +523,187 @@ def render_palette_categories():
         if y >= h - 6:
             break
         cat_name, cat_chars = PALETTE_CATEGORIES[i]
-        is_selected = (i == state.palette_category)
+        is_selected = (i == selected)
 
         # Hotkey prefix
         hotkey = CATEGORY_HOTKEYS[i] if i < len(CATEGORY_HOTKEYS) else '?'
-        models.root.put_string(2, y, f"{hotkey}-", hotkey_color)
+        add((2, y, f"{hotkey}-", hotkey_color))
 
         # Selection indicator
         if is_selected:
-            models.root.put(5, y, '▶', selected_color)
+            add((5, y, '▶', selected_color))
             name_color = selected_color
         else:
             name_color = normal_color
 
         # Category name
-        models.root.put_string(7, y, cat_name[:12].ljust(12), name_color)
+        add((7, y, cat_name[:12].ljust(12), name_color))
 
         # Preview chars (first 18)
         preview = ''.join(cat_chars[:18]) if cat_chars else "(empty)"
-        models.root.put_string(20, y, preview[:36], preview_color)
+        add((20, y, preview[:36], preview_color))
 
         y += 1
 
     # Special options row (fixed position above footer)
     special_y = h - 4
-    models.root.put_string(2, special_y, "─" * 54, (60, 60, 80))
+    add((2, special_y, _HR_54, (60, 60, 80)))
     special_y += 1
 
     # Vicinity option
-    models.root.put_string(2, special_y, "[v]icinity", heading_color)
+    add((2, special_y, "[v]icinity", heading_color))
 
     # Random and Codepoint on same line
-    models.root.put_string(24, special_y, "[r]andom", heading_color)
-    models.root.put_string(36, special_y, "[u] U+codepoint", heading_color)
+    add((24, special_y, "[r]andom", heading_color))
+    add((36, special_y, "[u] U+codepoint", heading_color))
 
     # Footer
-    models.root.put_string(0, h - 2, "═" * w, (60, 60, 80))
+    add((0, h - 2, _HR_DOUBLE, (60, 60, 80)))
     footer = "j/k =/- hotkey  Enter:select  Esc:cancel"
-    models.root.put_string((w - len(footer)) // 2, h - 1, footer, (100, 100, 120))
+    add(((w - len(footer)) // 2, h - 1, footer, (100, 100, 120)))
+    return tuple(batch)
+
+
+_qwerty_key = None
+_qwerty_batch = ()
 
 
 def render_palette_qwerty():
     """Render the QWERTY keyboard picker (Screen 2)"""
-    # Hide other windows
-    models.sprite_win.visible = False
-    models.status_win.visible = False
+    global _qwerty_key, _qwerty_batch
+    # Background
+    fill_background((20, 20, 30))
 
+    # Check if shift is held to show extended range
+    shift_held = bool(pygame.key.get_mods() & pygame.KMOD_SHIFT)
+
+    # The layout only changes with the category (and its contents), shift and
+    # current char, so key on those instead of hashing the chars every frame
+    category = state.palette_category
+    if category == -1:  # Vicinity mode
+        contents = state.last_selected_codepoint
+    elif category == 0:  # Recent
+        contents = state.recent_version
+    else:
+        contents = None
+    key = (category, contents, shift_held, state.current_char)
+    if key != _qwerty_key:
+        if category == -1:
+            cat_name = "Vicinity"
+            cat_chars = generate_vicinity_chars(state.last_selected_codepoint, 80)
+        else:
+            cat_name, cat_chars = PALETTE_CATEGORIES[category]
+        _qwerty_batch = build_palette_qwerty(cat_name, cat_chars, shift_held, state.current_char)
+        _qwerty_key = key
+    put_strings(models.root, _qwerty_batch)
+
+
+def build_palette_qwerty(cat_name: str, cat_chars, shift_held: bool, current_char: str) -> tuple:
+    """Lay out the QWERTY picker as (x, y, text, color) strings."""
     w, h = ROOT_WIDTH, ROOT_HEIGHT
     title_color = (100, 200, 255)
     key_color = (80, 80, 100)
     char_color = (200, 200, 255)
     empty_color = (50, 50, 60)
 
-    # Background
-    for y in range(h):
-        for x in range(w):
-            models.root.put(x, y, ' ', (20, 20, 30))
-
-    # Get current category (special handling for vicinity mode)
-    if state.palette_category == -1:  # Vicinity mode
-        cat_name = "Vicinity"
-        cat_chars = generate_vicinity_chars(state.last_selected_codepoint, 80)
-    else:
-        cat_name, cat_chars = PALETTE_CATEGORIES[state.palette_category]
+    batch = []
+    add = batch.append
 
-    # Check if shift is held to show extended range
-    shift_held = pygame.key.get_mods() & pygame.KMOD_SHIFT
-    char_offset = 40 if shift_held and len(cat_chars) > 40 else 0
+    n = len(cat_chars)
+    char_offset = 40 if shift_held and n > 40 else 0
+    end = min(n, char_offset + 40)
 
     # Title
-    if shift_held and len(cat_chars) > 40:
-        title = f"{cat_name} ({len(cat_chars)} chars) [SHIFT: 41-{min(80, len(cat_chars))}]"
+    if shift_held and n > 40:
+        title = f"{cat_name} ({n} chars) [SHIFT: 41-{min(80, n)}]"
     else:
-        title = f"{cat_name} ({len(cat_chars)} chars)"
-    models.root.put_string(2, 1, title, title_color)
-    models.root.put_string(w - 6, 1, "[Esc]", (100, 100, 120))
-    models.root.put_string(0, 2, "═" * w, (60, 60, 80))
-
-    # Draw QWERTY keyboard layout
-    # Each key cell is 4 chars wide: "│ X │"
-    cell_width = 4
-    start_y = 4
-    char_idx = char_offset
-
-    row_offsets = [4, 5, 6, 7]  # Indent for each row
-
-    for row_idx, row in enumerate(KEYBOARD_ROWS):
-        x = row_offsets[row_idx]
-        y = start_y + row_idx * 3
-
-        for key in row:
-            # Get character for this position
-            char = cat_chars[char_idx] if char_idx < len(cat_chars) else None
-
-            # Draw key label (small, above)
-            models.root.put(x + 1, y, key, key_color)
-
-            # Draw character (centered)
-            if char:
-                models.root.put(x + 1, y + 1, char, char_color)
-            else:
-                models.root.put(x + 1, y + 1, '·', empty_color)
+        title = f"{cat_name} ({n} chars)"
+    add((2, 1, title, title_color))
+    add((w - 6, 1, "[Esc]", (100, 100, 120)))
+    add((0, 2, _HR_DOUBLE, (60, 60, 80)))
 
-            char_idx += 1
-            x += cell_width
+    # Draw QWERTY keyboard layout: one label string per row, then each
+    # character below its key (chars may be double-width, so no joining)
+    start_y = 4
+    for x, y, labels in _KEY_LABEL_ROWS:
+        add((x, y, labels, key_color))
+    for i, (x, y, key) in enumerate(_KEY_POSITIONS):
+        char_idx = char_offset + i
+        char = cat_chars[char_idx] if char_idx < end else None
+        if char:
+            add((x, y + 1, char, char_color))
+        else:
+            add((x, y + 1, '·', empty_color))
 
     # Show shift hint if more chars available
-    if len(cat_chars) > 40:
+    if n > 40:
         if shift_held:
             shift_hint = "Release Shift for chars 1-40"
         else:
-            shift_hint = f"Hold Shift for chars 41-{min(80, len(cat_chars))}"
-        models.root.put_string(4, start_y + 13, shift_hint, (150, 150, 180))
+            shift_hint = f"Hold Shift for chars 41-{min(80, n)}"
+        add((4, start_y + 13, shift_hint, (150, 150, 180)))
 
     # Current character info
     info_y = h - 4
-    models.root.put_string(4, info_y, f"Current: {state.current_char}", (150, 200, 150))
-    code = ord(state.current_char)
-    models.root.put_string(20, info_y, f"U+{code:04X}", (120, 120, 140))
+    add((4, info_y, f"Current: {current_char}", (150, 200, 150)))
+    add((20, info_y, format_codepoint(current_char), (120, 120, 140)))
 
     # Footer
-    models.root.put_string(0, h - 2, "═" * w, (60, 60, 80))
+    add((0, h - 2, _HR_DOUBLE, (60, 60, 80)))
     footer = "Press key to select   Hold Shift for more   Esc:back"
-    models.root.put_string((w - len(footer)) // 2, h - 1, footer, (100, 100, 120))
+    add(((w - len(footer)) // 2, h - 1, footer, (100, 100, 120)))
+    return tuple(batch)
 
 
 def render_palette_codepoint():
     """Render the codepoint entry screen"""
-    # Hide other windows
-    models.sprite_win.visible = False
-    models.status_win.visible = False
+    # Background
+    fill_background((20, 20, 30))
+
+    # The rest of the screen only changes as the buffer is typed
+    put_strings(models.root, build_codepoint_screen(state.codepoint_buffer))
+
 
+@lru_cache(maxsize=64)
+def build_codepoint_screen(buffer: str) -> tuple:
+    """Lay out the codepoint entry screen as (x, y, text, color) strings."""
     w, h = ROOT_WIDTH, ROOT_HEIGHT
     title_color = (100, 200, 255)
 
-    # Background
-    for y in range(h):
-        for x in range(w):
-            models.root.put(x, y, ' ', (20, 20, 30))
+    batch = []
+    add = batch.append
 
     # Title
     title = "ENTER CODEPOINT"
-    models.root.put_string((w - len(title)) // 2, 1, title, title_color)
-    models.root.put_string(0, 2, "═" * w, (60, 60, 80))
+    add(((w - len(title)) // 2, 1, title, title_color))
+    add((0, 2, _HR_DOUBLE, (60, 60, 80)))
 
     # Input prompt
     prompt_y = h // 2 - 2
-    models.root.put_string(10, prompt_y, "Enter hex codepoint:", (180, 180, 180))
+    add((10, prompt_y, "Enter hex codepoint:", (180, 180, 180)))
 
     # Input field
     input_y = prompt_y + 2
-    models.root.put_string(10, input_y, "U+", (150, 150, 200))
-    models.root.put_string(12, input_y, state.codepoint_buffer.upper().ljust(6, '_'), (100, 255, 100))
-    models.root.put(12 + len(state.codepoint_buffer), input_y, '█', (100, 255, 100))
+    add((10, input_y, "U+", (150, 150, 200)))
+    add((12, input_y, buffer.upper().ljust(6, '_'), (100, 255, 100)))
+    add((12 + len(buffer), input_y, '█', (100, 255, 100)))
 
     # Preview character if valid
-    if state.codepoint_buffer:
+    if buffer:
         try:
-            cp = int(state.codepoint_buffer, 16)
+            cp = int(buffer, 16)
             if 0x20 <= cp <= 0x10FFFF:
                 char = chr(cp)
-                models.root.put_string(10, input_y + 2, "Preview: ", (150, 150, 180))
-                models.root.put(19, input_y + 2, char, (200, 200, 255))
+                add((10, input_y + 2, "Preview: ", (150, 150, 180)))
+                add((19, input_y + 2, char, (200, 200, 255)))
         except (ValueError, OverflowError):
-            models.root.put_string(10, input_y + 2, "Invalid codepoint", (255, 100, 100))
+            add((10, input_y + 2, "Invalid codepoint", (255, 100, 100)))
 
     # Footer
-    models.root.put_string(0, h - 2, "═" * w, (60, 60, 80))
+    add((0, h - 2, _HR_DOUBLE, (60, 60, 80)))
     footer = "0-9, a-f: type   Enter: select   Esc: cancel"
-    models.root.put_string((w - len(footer)) // 2, h - 1, footer, (100, 100, 120))
+    add(((w - len(footer)) // 2, h - 1, footer, (100, 100, 120)))
+    return tuple(batch)
 
 
 # ============================================================================
@@ -507,10 +712,102 @@ def render_palette_codepoint():
 
 def render_help_overlay():
     """Render full-screen help overlay with pagination"""
-    # Hide other windows during help
-    models.sprite_win.visible = False
-    models.status_win.visible = False
-
+    # Background
+    fill_background((30, 30, 40))
+
+    # The whole overlay is static per page, so it is laid out once and replayed
+    put_strings(models.root, build_help_page(state.help_page))
+
+
+# Help page layout: per page, columns of (heading_x, sections); each section is
+# (heading, desc_x, dim_keys, rows) and each row is (key, desc or None)
+HELP_PAGES = (
+    # PAGE 1: General controls (left column ends before 31)
+    (
+        (2, (
+            ("NAVIGATION", 12, False, (
+                ("hjkl", "Move cursor"),
+                ("0 / $", "Line start/end"),
+                ("gg / G", "Top/bottom"),
+            )),
+            ("DRAWING", 12, False, (
+                ("Space", "Stamp char"),
+                ("i", "Insert mode"),
+                ("x", "Delete char"),
+                ("c", "Pick char under"),
+                ("C", "Pick color under"),
+                ("f", "Cycle FG color"),
+            )),
+            ("ANIMATION", 12, False, (
+                (", .", "Prev/next frame"),
+                ("Tab", "Play/stop"),
+            )),
+        )),
+        (31, (
+            ("PALETTE (p)", 41, False, (
+                ("j/k", "Navigate"),
+                ("Enter", "QWERTY mode"),
+                ("r", "Random char"),
+                ("u", "Codepoint"),
+            )),
+            ("VISUAL MODE (v)", 41, False, (
+                ("y", "Yank"),
+                ("d", "Delete"),
+                ("r", "Fill"),
+                ("P", "Paste"),
+            )),
+            ("COMMANDS", 42, False, (
+                (":sprite", "New sprite"),
+                (":w :q", "Save/quit"),
+                (":frame", "Add frame"),
+                (":anim", "Anim editor"),
+            )),
+        )),
+    ),
+    # PAGE 2: Scene mode (left column ends before 31)
+    (
+        (2, (
+            ("SCENE KEYS", 12, False, (
+                ("t", "Toggle tool"),
+                ("S", "Sprite picker"),
+                ("I", "Library mgr"),
+                ("D", "Delete sprite"),
+                ("a", "Cycle anim"),
+                ("Space", "Place"),
+            )),
+            ("SCENE COMMANDS", 12, False, (
+                (":scene WxH", None),
+                (":import path", None),
+                (":unimport path", None),
+                (":library", None),
+                (":tool char|sprite", None),
+            )),
+        )),
+        (31, (
+            ("SPRITE PICKER", 41, False, (
+                ("hjkl", "Navigate"),
+                ("Enter", "Select"),
+                ("Esc", "Cancel"),
+            )),
+            ("LIBRARY MANAGER", 41, False, (
+                ("j/k", "Navigate"),
+                ("d", "Unload"),
+                ("Esc", "Close"),
+            )),
+            ("WORKFLOW", 36, True, (
+                ("1.", ":scene 40x30"),
+                ("2.", ":import file.py"),
+                ("3.", "S pick, Space"),
+                ("4.", ":w level.py"),
+            )),
+        )),
+    ),
+)
+
+
+@lru_cache(maxsize=None)
+def build_help_page(page: int) -> tuple:
+    """Lay out a help page (title, body and footer) as (x, y, text, color) strings."""
     w, h = ROOT_WIDTH, ROOT_HEIGHT
     title_color = (100, 200, 255)
     heading_color = (255, 200, 100)
@@ -518,106 +815,33 @@ def render_help_overlay():
     desc_color = (180, 180, 180)
     dim_color = (100, 100, 120)
 
-    # Background
-    for y in range(h):
-        for x in range(w):
-            models.root.put(x, y, ' ', (30, 30, 40))
+    batch = []
+    add = batch.append
 
     # Title with page indicator
-    total_pages = 2
-    page_num = state.help_page + 1
-    if state.help_page == 0:
-        title = "HELP - GENERAL"
-    else:
-        title = "HELP - SCENE MODE"
-    models.root.put_string((w - len(title)) // 2, 1, title, title_color)
-
-    # Page indicator
-    page_ind = f"[{page_num}/{total_pages}]"
-    models.root.put_string(w - len(page_ind) - 1, 1, page_ind, dim_color)
+    title = "HELP - GENERAL" if page == 0 else "HELP - SCENE MODE"
+    add(((w - len(title)) // 2, 1, title, title_color))
+    page_ind = f"[{page + 1}/{len(HELP_PAGES)}]"
+    add((w - len(page_ind) - 1, 1, page_ind, dim_color))
+    add((0, 2, _HR_DOUBLE, (60, 60, 80)))
 
-    models.root.put_string(0, 2, "═" * w, (60, 60, 80))
-
-    if state.help_page == 0:
-        # PAGE 1: General controls (left column ends before 31)
-        y = 4
-        models.root.put_string(2, y, "NAVIGATION", heading_color); y += 1
-        models.root.put_string(4, y, "hjkl", key_color); models.root.put_string(12, y, "Move cursor", desc_color); y += 1
-        models.root.put_string(4, y, "0 / $", key_color); models.root.put_string(12, y, "Line start/end", desc_color); y += 1
-        models.root.put_string(4, y, "gg / G", key_color); models.root.put_string(12, y, "Top/bottom", desc_color); y += 2
-
-        models.root.put_string(2, y, "DRAWING", heading_color); y += 1
-        models.root.put_string(4, y, "Space", key_color); models.root.put_string(12, y, "Stamp char", desc_color); y += 1
-        models.root.put_string(4, y, "i", key_color); models.root.put_string(12, y, "Insert mode", desc_color); y += 1
-        models.root.put_string(4, y, "x", key_color); models.root.put_string(12, y, "Delete char", desc_color); y += 1
-        models.root.put_string(4, y, "c", key_color); models.root.put_string(12, y, "Pick char under", desc_color); y += 1
-        models.root.put_string(4, y, "C", key_color); models.root.put_string(12, y, "Pick color under", desc_color); y += 1
-        models.root.put_string(4, y, "f", key_color); models.root.put_string(12, y, "Cycle FG color", desc_color); y += 2
-
-        models.root.put_string(2, y, "ANIMATION", heading_color); y += 1
-        models.root.put_string(4, y, ", .", key_color); models.root.put_string(12, y, "Prev/next frame", desc_color); y += 1
-        models.root.put_string(4, y, "Tab", key_color); models.root.put_string(12, y, "Play/stop", desc_color); y += 1
-
-        # Right column starts at 31
-        y2 = 4
-        models.root.put_string(31, y2, "PALETTE (p)", heading_color); y2 += 1
-        models.root.put_string(33, y2, "j/k", key_color); models.root.put_string(41, y2, "Navigate", desc_color); y2 += 1
-        models.root.put_string(33, y2, "Enter", key_color); models.root.put_string(41, y2, "QWERTY mode", desc_color); y2 += 1
-        models.root.put_string(33, y2, "r", key_color); models.root.put_string(41, y2, "Random char", desc_color); y2 += 1
-        models.root.put_string(33, y2, "u", key_color); models.root.put_string(41, y2, "Codepoint", desc_color); y2 += 2
-
-        models.root.put_string(31, y2, "VISUAL MODE (v)", heading_color); y2 += 1
-        models.root.put_string(33, y2, "y", key_color); models.root.put_string(41, y2, "Yank", desc_color); y2 += 1
-        models.root.put_string(33, y2, "d", key_color); models.root.put_string(41, y2, "Delete", desc_color); y2 += 1
-        models.root.put_string(33, y2, "r", key_color); models.root.put_string(41, y2, "Fill", desc_color); y2 += 1
-        models.root.put_string(33, y2, "P", key_color); models.root.put_string(41, y2, "Paste", desc_color); y2 += 2
-
-        models.root.put_string(31, y2, "COMMANDS", heading_color); y2 += 1
-        models.root.put_string(33, y2, ":sprite", key_color); models.root.put_string(42, y2, "New sprite", desc_color); y2 += 1
-        models.root.put_string(33, y2, ":w :q", key_color); models.root.put_string(42, y2, "Save/quit", desc_color); y2 += 1
-        models.root.put_string(33, y2, ":frame", key_color); models.root.put_string(42, y2, "Add frame", desc_color); y2 += 1
-        models.root.put_string(33, y2, ":anim", key_color); models.root.put_string(42, y2, "Anim editor", desc_color); y2 += 1
-
-    else:
-        # PAGE 2: Scene mode (left column ends before 31)
+    for heading_x, sections in HELP_PAGES[page]:
         y = 4
-        models.root.put_string(2, y, "SCENE KEYS", heading_color); y += 1
-        models.root.put_string(4, y, "t", key_color); models.root.put_string(12, y, "Toggle tool", desc_color); y += 1
-        models.root.put_string(4, y, "S", key_color); models.root.put_string(12, y, "Sprite picker", desc_color); y += 1
-        models.root.put_string(4, y, "I", key_color); models.root.put_string(12, y, "Library mgr", desc_color); y += 1
-        models.root.put_string(4, y, "D", key_color); models.root.put_string(12, y, "Delete sprite", desc_color); y += 1
-        models.root.put_string(4, y, "a", key_color); models.root.put_string(12, y, "Cycle anim", desc_color); y += 1
-        models.root.put_string(4, y, "Space", key_color); models.root.put_string(12, y, "Place", desc_color); y += 2
-
-        models.root.put_string(2, y, "SCENE COMMANDS", heading_color); y += 1
-        models.root.put_string(4, y, ":scene WxH", key_color); y += 1
-        models.root.put_string(4, y, ":import path", key_color); y += 1
-        models.root.put_string(4, y, ":unimport path", key_color); y += 1
-        models.root.put_string(4, y, ":library", key_color); y += 1
-        models.root.put_string(4, y, ":tool char|sprite", key_color); y += 1
-
-        # Right column starts at 31
-        y2 = 4
-        models.root.put_string(31, y2, "SPRITE PICKER", heading_color); y2 += 1
-        models.root.put_string(33, y2, "hjkl", key_color); models.root.put_string(41, y2, "Navigate", desc_color); y2 += 1
-        models.root.put_string(33, y2, "Enter", key_color); models.root.put_string(41, y2, "Select", desc_color); y2 += 1
-        models.root.put_string(33, y2, "Esc", key_color); models.root.put_string(41, y2, "Cancel", desc_color); y2 += 2
-
-        models.root.put_string(31, y2, "LIBRARY MANAGER", heading_color); y2 += 1
-        models.root.put_string(33, y2, "j/k", key_color); models.root.put_string(41, y2, "Navigate", desc_color); y2 += 1
-        models.root.put_string(33, y2, "d", key_color); models.root.put_string(41, y2, "Unload", desc_color); y2 += 1
-        models.root.put_string(33, y2, "Esc", key_color); models.root.put_string(41, y2, "Close", desc_color); y2 += 2
-
-        models.root.put_string(31, y2, "WORKFLOW", heading_color); y2 += 1
-        models.root.put_string(33, y2, "1.", dim_color); models.root.put_string(36, y2, ":scene 40x30", desc_color); y2 += 1
-        models.root.put_string(33, y2, "2.", dim_color); models.root.put_string(36, y2, ":import file.py", desc_color); y2 += 1
-        models.root.put_string(33, y2, "3.", dim_color); models.root.put_string(36, y2, "S pick, Space", desc_color); y2 += 1
-        models.root.put_string(33, y2, "4.", dim_color); models.root.put_string(36, y2, ":w level.py", desc_color); y2 += 1
+        for heading, desc_x, dim_keys, rows in sections:
+            add((heading_x, y, heading, heading_color))
+            y += 1
+            for key, desc in rows:
+                add((heading_x + 2, y, key, dim_color if dim_keys else key_color))
+                if desc is not None:
+                    add((desc_x, y, desc, desc_color))
+                y += 1
+            y += 1  # Blank line between sections
 
     # Footer
-    models.root.put_string(0, h - 2, "═" * w, (60, 60, 80))
+    add((0, h - 2, _HR_DOUBLE, (60, 60, 80)))
     footer = "←/→ or h/l: switch page  |  Esc/Enter: close"
-    models.root.put_string((w - len(footer)) // 2, h - 1, footer, (150, 150, 150))
+    add(((w - len(footer)) // 2, h - 1, footer, (150, 150, 150)))
+    return tuple(batch)
 
 
 # ============================================================================
@@ -626,10 +850,6 @@ def render_help_overlay():
 
 def render_animation_editor():
     """Render full-screen animation assembly editor"""
-    # Hide other windows during animation editor
-    models.sprite_win.visible = False
-    models.status_win.visible = False
-
     w, h = ROOT_WIDTH, ROOT_HEIGHT
     title_color = (255, 150, 50)
     heading_color = (255, 200, 100)
@@ -638,22 +858,20 @@ def render_animation_editor():
     dim_color = (100, 100, 120)
 
     # Background
-    for y in range(h):
-        for x in range(w):
-            models.root.put(x, y, ' ', (30, 30, 40))
+    fill_background((30, 30, 40))
 
     # Title
     title = "ANIMATION EDITOR"
     models.root.put_string((w - len(title)) // 2, 1, title, title_color)
-    models.root.put_string(0, 2, "═" * w, (60, 60, 80))
+    models.root.put_string(0, 2, _HR_DOUBLE, (60, 60, 80))
 
     # Get list of animations
-    anim_names = sorted(state.animations.keys()) if state.animations else []
+    anim_names = get_sorted_animation_names()
 
     if state.anim_editor_mode == "list":
         # Left side: Animation list
         models.root.put_string(2, 4, "ANIMATIONS", heading_color)
-        models.root.put_string(2, 5, "─" * 20, dim_color)
+        models.root.put_string(2, 5, _HR_20, dim_color)
 
         if not anim_names:
             models.root.put_string(2, 7, "(no animations)", dim_color)
@@ -674,23 +892,20 @@ def render_animation_editor():
 
         # Right side: Selected animation details
         models.root.put_string(32, 4, "DETAILS", heading_color)
-        models.root.put_string(32, 5, "─" * 25, dim_color)
+        models.root.put_string(32, 5, _HR_25, dim_color)
 
         if anim_names and 0 <= state.anim_editor_cursor < len(anim_names):
             anim_name = anim_names[state.anim_editor_cursor]
             anim = state.animations[anim_name]
             models.root.put_string(32, 7, f"Name: {anim_name}", normal_color)
-            models.root.put_string(32, 8, f"Duration: {anim.frame_duration:.2f}s/frame", normal_color)
+            models.root.put_string(32, 8, "Duration: " + format_duration(anim.frame_duration), normal_color)
             models.root.put_string(32, 9, f"Loop: {'Yes' if anim.loop else 'No'}", normal_color)
             models.root.put_string(32, 10, f"Frames: {len(anim.frames)}", normal_color)
 
             # Show frame sequence
             models.root.put_string(32, 12, "Sequence:", heading_color)
-            seq = " ".join(f"F{af.frame_index+1}" + (f"({af.offset_x},{af.offset_y})" if af.offset_x or af.offset_y else "")
-                         for af in anim.frames[:8])
-            if len(anim.frames) > 8:
-                seq += "..."
-            models.root.put_string(32, 13, seq[:26], dim_color)
+            shown = tuple((af.frame_index, af.offset_x, af.offset_y) for af in anim.frames[:8])
+            models.root.put_string(32, 13, format_frame_sequence(shown, len(anim.frames) > 8), dim_color)
         else:
             models.root.put_string(32, 7, "(select an animation)", dim_color)
 
@@ -702,9 +917,9 @@ def render_animation_editor():
 
             models.root.put_string(2, 4, f"EDITING: {anim_name}", heading_color)
             # Show duration and loop status
-            models.root.put_string(25, 4, f"{anim.frame_duration:.2f}s/frame", normal_color)
+            models.root.put_string(25, 4, format_duration(anim.frame_duration), normal_color)
             models.root.put_string(45, 4, f"Loop: {'ON' if anim.loop else 'OFF'}", selected_color if anim.loop else dim_color)
-            models.root.put_string(2, 5, "─" * 56, dim_color)
+            models.root.put_string(2, 5, _HR_56, dim_color)
 
             # Show frames in animation
             models.root.put_string(2, 7, "FRAMES IN ANIMATION", heading_color)
@@ -724,12 +939,13 @@ def render_animation_editor():
 
             # Show available sprite frames on right
             models.root.put_string(32, 7, f"SPRITE FRAMES (1-{min(len(state.frames), 9)})", heading_color)
+            used_frame_indices = {af.frame_index for af in anim.frames}
             for i in range(min(len(state.frames), 9)):
-                marker = "+" if any(af.frame_index == i for af in anim.frames) else " "
+                marker = "+" if i in used_frame_indices else " "
                 models.root.put_string(32, 9 + i, f"{marker} {i+1}: Frame {i + 1}", dim_color)
 
     # Controls at bottom
-    models.root.put_string(0, h - 5, "═" * w, (60, 60, 80))
+    models.root.put_string(0, h - 5, _HR_DOUBLE, (60, 60, 80))
     if state.anim_editor_mode == "list":
         models.root.put_string(2, h - 4, "j/k:Navigate  n:New  Enter:Edit  d:Delete  Space:Preview  Esc:Close", dim_color)
     else:
@@ -749,23 +965,15 @@ def start_animation_preview():
 
     # Convert our frames to pyunicodegame SpriteFrame objects
     pug_frames = []
+    w, h = state.canvas_width, state.canvas_height
     for our_frame in state.frames:
-        # Build 2D char and color arrays
-        chars = []
-        fg_colors = []
-        for y in range(state.canvas_height):
-            char_row = []
-            color_row = []
-            for x in range(state.canvas_width):
-                cell = our_frame.cells.get((x, y))
-                if cell:
-                    char_row.append(cell.char)
-                    color_row.append(cell.fg)
-                else:
-                    char_row.append(' ')
-                    color_row.append(None)
-            chars.append(char_row)
-            fg_colors.append(color_row)
+        # Build 2D char and color arrays: blank rows, then scatter the sparse cells
+        chars = [[' '] * w for _ in range(h)]
+        fg_colors = [[None] * w for _ in range(h)]
+        for (x, y), cell in our_frame.cells.items():
+            if 0 <= x < w and 0 <= y < h:
+                chars[y][x] = cell.char
+                fg_colors[y][x] = cell.fg
 
         pug_frame = pyunicodegame.SpriteFrame(chars, fg_colors)
         pug_frames.append(pug_frame)
@@ -808,15 +1016,10 @@ def stop_animation_preview():
 
 def render_animation_preview():
     """Render full-screen animation preview using real pyunicodegame sprite"""
-    models.sprite_win.visible = False
-    models.status_win.visible = False
-
     w, h = ROOT_WIDTH, ROOT_HEIGHT
 
     # Clear background - the sprite will render on top automatically
-    for y in range(h):
-        for x in range(w):
-            models.root.put(x, y, ' ', (20, 20, 30))
+    fill_background((20, 20, 30))
 
     # Show help at bottom
     help_text = "Press Space/Esc/Q to exit preview"
@@ -829,9 +1032,6 @@ def render_animation_preview():
 
 def render_sprite_library():
     """Render full-screen sprite library manager"""
-    models.sprite_win.visible = False
-    models.status_win.visible = False
-
     w, h = ROOT_WIDTH, ROOT_HEIGHT
     title_color = (100, 200, 255)
     heading_color = (150, 220, 255)
@@ -840,24 +1040,22 @@ def render_sprite_library():
     dim_color = (100, 100, 120)
 
     # Background
-    for y in range(h):
-        for x in range(w):
-            models.root.put(x, y, ' ', (25, 30, 40))
+    fill_background((25, 30, 40))
 
     # Title
     title = "SPRITE LIBRARY"
     models.root.put_string((w - len(title)) // 2, 1, title, title_color)
-    models.root.put_string(0, 2, "═" * w, (60, 60, 80))
+    models.root.put_string(0, 2, _HR_DOUBLE, (60, 60, 80))
 
     # Get list of loaded libraries
-    lib_paths = sorted(state.sprite_library.keys())
+    lib_paths = get_sorted_library_paths()
 
     if not lib_paths:
         models.root.put_string(2, 5, "(no sprite files loaded)", dim_color)
         models.root.put_string(2, 7, "Use :import <file.py> to load sprites", dim_color)
     else:
         models.root.put_string(2, 4, "LOADED FILES", heading_color)
-        models.root.put_string(2, 5, "─" * 40, dim_color)
+        models.root.put_string(2, 5, _HR_40, dim_color)
 
         y = 7
         for i, lib_path in enumerate(lib_paths):
@@ -890,16 +1088,13 @@ def render_sprite_library():
             y += 1  # Spacing between libraries
 
     # Controls at bottom
-    models.root.put_string(0, h - 4, "═" * w, (60, 60, 80))
+    models.root.put_string(0, h - 4, _HR_DOUBLE, (60, 60, 80))
     models.root.put_string(2, h - 3, "j/k:Navigate  d:Unload  n:Import new  Esc:Close", dim_color)
     models.root.put_string(2, h - 2, f"Loaded: {len(lib_paths)} files, {len(get_all_library_sprites())} sprites", dim_color)
 
 
 def render_sprite_picker():
     """Render sprite picker grid for placement"""
-    models.sprite_win.visible = False
-    models.status_win.visible = False
-
     w, h = ROOT_WIDTH, ROOT_HEIGHT
     title_color = (255, 200, 100)
     selected_color = (100, 255, 100)
@@ -907,14 +1102,12 @@ def render_sprite_picker():
     dim_color = (100, 100, 120)
 
     # Background
-    for y in range(h):
-        for x in range(w):
-            models.root.put(x, y, ' ', (30, 30, 35))
+    fill_background((30, 30, 35))
 
     # Title
     title = "SELECT SPRITE"
     models.root.put_string((w - len(title)) // 2, 1, title, title_color)
-    models.root.put_string(0, 2, "═" * w, (60, 60, 80))
+    models.root.put_string(0, 2, _HR_DOUBLE, (60, 60, 80))
 
     # Get all sprites
     all_sprites = get_all_library_sprites()
@@ -928,7 +1121,10 @@ def render_sprite_picker():
         cell_width = 14
         start_y = 4
 
-        for i, (library_key, sprite_name, sprite_def) in enumerate(all_sprites):
+        previews = get_library_sprite_previews()
+        cursor = state.sprite_picker_cursor
+
+        for i, (preview_char, name_display) in enumerate(previews):
             if start_y + (i // cols) * 4 >= h - 5:
                 break
 
@@ -937,33 +1133,44 @@ def render_sprite_picker():
             x = 2 + col * cell_width
             y = start_y + row * 4
 
-            is_selected = i == state.sprite_picker_cursor
+            is_selected = i == cursor
             color = selected_color if is_selected else normal_color
 
-            # Draw selection box
-            if is_selected:
-                models.root.put_string(x, y, "┌" + "─" * 10 + "┐", selected_color)
-                models.root.put_string(x, y + 2, "└" + "─" * 10 + "┘", selected_color)
-                models.root.put(x, y + 1, "│", selected_color)
-                models.root.put(x + 11, y + 1, "│", selected_color)
-
             # Show first char of sprite as preview
-            first_frame = sprite_def.get('frames', [{}])[0]
-            chars = first_frame.get('chars', [[]])
-            if chars and chars[0]:
-                preview_char = chars[0][0] if chars[0][0] != ' ' else '?'
-            else:
-                preview_char = '?'
-
             models.root.put(x + 5, y + 1, preview_char, color)
 
             # Sprite name (truncated)
-            name_display = sprite_name[:10]
             models.root.put_string(x + 1, y + 3, name_display, dim_color if not is_selected else normal_color)
 
+        # Draw selection box once, outside the per-sprite loop
+        if 0 <= cursor < len(previews) and start_y + (cursor // cols) * 4 < h - 5:
+            x = 2 + (cursor % cols) * cell_width
+            y = start_y + (cursor // cols) * 4
+            models.root.put_string(x, y, _PICKER_BOX_TOP, selected_color)
+            models.root.put_string(x, y + 2, _PICKER_BOX_BOTTOM, selected_color)
+            models.root.put(x, y + 1, "│", selected_color)
+            models.root.put(x + 11, y + 1, "│", selected_color)
+
     # Controls at bottom
-    models.root.put_string(0, h - 4, "═" * w, (60, 60, 80))
+    models.root.put_string(0, h - 4, _HR_DOUBLE, (60, 60, 80))
     models.root.put_string(2, h - 3, "hjkl:Navigate  Enter:Select  Esc:Cancel", dim_color)
     if all_sprites and 0 <= state.sprite_picker_cursor < len(all_sprites):
         lib_key, name, _ = all_sprites[state.sprite_picker_cursor]
         models.root.put_string(2, h - 2, f"Selected: {name} from {lib_key.split(':')[0]}", normal_color)
+
+
+# ============================================================================
+# OVERLAY DISPATCH
+# ============================================================================
+
+# Full-screen modes and the renderer that owns the whole frame for each
+OVERLAY_RENDERERS = {
+    EditorMode.HELP: render_help_overlay,
+    EditorMode.PALETTE_CATEGORIES: render_palette_categories,
+    EditorMode.PALETTE_QWERTY: render_palette_qwerty,
+    EditorMode.PALETTE_CODEPOINT: render_palette_codepoint,
+    EditorMode.ANIMATION_EDITOR: render_animation_editor,
+    EditorMode.ANIMATION_PREVIEW: render_animation_preview,
+    EditorMode.SPRITE_LIBRARY: render_sprite_library,
+    EditorMode.SPRITE_PICKER: render_sprite_picker,
+}